@@ -0,0 +1,220 @@
+"""Opt-in per-cell tracing shared by both notebooks.
+
+The notebooks only import this module when `WRAPPED_TRACE` is set, so the
+WASM export never needs it. `install` relies on marimo's private execution
+hooks, which were tested with marimo 0.10.9; if a later version moves them,
+`install` warns and only the OMDb and cache counters are recorded.
+"""
+
+import os
+import json
+import time
+import threading
+
+import polars as pl
+
+
+class CellTracer:
+    """
+    Records the wall time, CPU time and peak memory of every cell, plus
+    the OMDb calls and metadata cache lookups of `get_movie_data`, and
+    writes them as a Chrome trace (chrome://tracing or ui.perfetto.dev).
+
+    `install` hooks it into the marimo kernel, so `marimo edit` and
+    `marimo run` are traced; `scripts/profile_startup.py --trace` drives
+    it when the notebook runs as a script. The kernel's hooks are shared by
+    every session of a `marimo run` server, so a tracer only records the
+    cells of the thread that created it, i.e. its own session. CPU time
+    is that of the session's thread; peak memory can only be read for the
+    whole process, so it is left empty while other sessions are traced.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.events = []
+        self.counters = {
+            "omdb_calls": 0,
+            "omdb_errors": 0,
+            "omdb_seconds": 0.0,
+            "cache_hits": 0,
+            "cache_misses": 0,
+        }
+        self._origin = time.perf_counter()
+        self._thread = threading.current_thread()
+        self._running = {}
+        self._lock = threading.Lock()
+        self._hooks = None
+
+    def _us(self, t):
+        return (t - self._origin) * 1e6
+
+    @staticmethod
+    def _memory_mib(field):
+        # VmHWM is the peak RSS since the last reset, VmRSS the current one
+        try:
+            with open("/proc/self/status") as f:
+                for line in f:
+                    if line.startswith(f"{field}:"):
+                        return int(line.split()[1]) / 1024
+        except OSError:
+            return None
+
+    @staticmethod
+    def _reset_peak():
+        # without a reset VmHWM is the peak of the whole process
+        try:
+            with open("/proc/self/clear_refs", "w") as f:
+                f.write("5")
+            return True
+        except OSError:
+            return False
+
+    def _alone(self):
+        # another session's cells would be counted in this one's peak, and
+        # resetting VmHWM would clear theirs
+        if self._hooks is None:
+            return True
+        owners = [getattr(hook, "__self__", None) for hook in list(self._hooks)]
+        live = [
+            owner for owner in owners
+            if type(owner).__name__ == "CellTracer" and owner._thread.is_alive()
+        ]
+        return len(live) <= 1
+
+    @staticmethod
+    def label(cell):
+        if cell.defs:
+            return ", ".join(sorted(cell.defs))[:40]
+        lines = cell.code.strip().splitlines()
+        return lines[0][:40] if lines else cell.cell_id
+
+    def cell_started(self, cell, runner=None):
+        if threading.current_thread() is not self._thread:
+            # a cell of another session
+            return
+        if runner is not None:
+            # the kernel copies its post-execution and finish hooks for
+            # every run, so they are attached to the running one here
+            for hook_list, hook in [
+                (getattr(runner, "post_execution_hooks", None), self.cell_finished),
+                (getattr(runner, "on_finish_hooks", None), self.write),
+            ]:
+                if hook_list is not None and hook not in hook_list:
+                    hook_list.append(hook)
+        reset = self._alone() and self._reset_peak()
+        self._running[cell.cell_id] = (
+            time.perf_counter(),
+            time.thread_time(),
+            self._memory_mib("VmRSS") if reset else None,
+        )
+
+    def cell_finished(self, cell, *_):
+        started = self._running.pop(cell.cell_id, None)
+        if started is None:
+            return
+        start, start_cpu, start_rss = started
+        end = time.perf_counter()
+        peak = self._memory_mib("VmHWM") if start_rss is not None else None
+        with self._lock:
+            self.events.append({
+                "name": self.label(cell),
+                "cat": "cell",
+                "ph": "X",
+                "ts": self._us(start),
+                "dur": (end - start) * 1e6,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": {
+                    "cell_id": cell.cell_id,
+                    "cpu_ms": (time.thread_time() - start_cpu) * 1000,
+                    "peak_mib": None if peak is None else max(peak - start_rss, 0.0),
+                },
+            })
+
+    def omdb_call(self, start, ok):
+        """Records an OMDb request that started at `start` (perf_counter)."""
+        end = time.perf_counter()
+        with self._lock:
+            self.counters["omdb_calls"] += 1
+            self.counters["omdb_errors"] += not ok
+            self.counters["omdb_seconds"] += end - start
+            self.events.append({
+                "name": "omdb",
+                "cat": "omdb",
+                "ph": "X",
+                "ts": self._us(start),
+                "dur": (end - start) * 1e6,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": {"ok": ok},
+            })
+
+    def cache_lookup(self, hit, count=1):
+        with self._lock:
+            self.counters["cache_hits" if hit else "cache_misses"] += count
+            self.events.append({
+                "name": "movie cache",
+                "ph": "C",
+                "ts": self._us(time.perf_counter()),
+                "pid": os.getpid(),
+                "args": {
+                    "hits": self.counters["cache_hits"],
+                    "misses": self.counters["cache_misses"],
+                },
+            })
+
+    def summary(self):
+        """One row per cell run, slowest first."""
+        with self._lock:
+            cells = [e for e in self.events if e.get("cat") == "cell"]
+        return pl.DataFrame(
+            {
+                "cell": [e["name"] for e in cells],
+                "wall_ms": [e["dur"] / 1000 for e in cells],
+                "cpu_ms": [e["args"]["cpu_ms"] for e in cells],
+                "peak_mib": [e["args"]["peak_mib"] for e in cells],
+            },
+            schema={
+                "cell": pl.String,
+                "wall_ms": pl.Float64,
+                "cpu_ms": pl.Float64,
+                "peak_mib": pl.Float64,
+            },
+        ).sort("wall_ms", descending=True)
+
+    def write(self, *_):
+        with self._lock:
+            trace = {
+                "traceEvents": list(self.events),
+                "displayTimeUnit": "ms",
+                "otherData": dict(self.counters),
+            }
+        with open(f"{self.path}.tmp", "w") as f:
+            json.dump(trace, f)
+        os.replace(f"{self.path}.tmp", self.path)
+
+    def install(self):
+        """
+        Hooks `cell_started` into the marimo kernel.
+
+        Returns:
+            bool: False if this marimo version has no execution hooks, in
+            which case only the OMDb calls and cache lookups are recorded.
+        """
+        try:
+            from marimo._runtime.runner.hooks import PRE_EXECUTION_HOOKS
+        except ImportError:
+            print("CellTracer: marimo has no execution hooks, cells are not traced")
+            return False
+
+        # re-running the instrumentation cell replaces this session's
+        # previous tracer, and the tracers of ended sessions are dropped
+        for hook in list(PRE_EXECUTION_HOOKS):
+            owner = getattr(hook, "__self__", None)
+            if type(owner).__name__ == "CellTracer" and (
+                owner._thread is self._thread or not owner._thread.is_alive()
+            ):
+                PRE_EXECUTION_HOOKS.remove(hook)
+        PRE_EXECUTION_HOOKS.append(self.cell_started)
+        self._hooks = PRE_EXECUTION_HOOKS
+        return True
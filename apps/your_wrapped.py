@@ -10,69 +10,246 @@ def _():
     import requests
     import os
     import io
+    import re
     import json
     import polars as pl
-    import plotly.express as px
     from dotenv import load_dotenv
-    from collections import Counter
-    from datetime import datetime
+    import sys
+    import time
+    import threading
+    from collections import defaultdict
+    from datetime import date, datetime
+    from functools import cached_property
     return (
-        Counter,
+        cached_property,
+        date,
         datetime,
+        defaultdict,
         io,
         json,
         load_dotenv,
         os,
         pl,
-        px,
+        re,
         requests,
+        sys,
+        threading,
+        time,
         zipfile,
     )
 
 
 @app.cell
-def _(io, pl, zipfile):
-    def process_zip_and_load_csv(file_contents):
-        with zipfile.ZipFile(io.BytesIO(file_contents)) as zf:
+def instrumentation(os):
+    # opt-in: WRAPPED_TRACE=trace.json records every cell and OMDb call,
+    # see apps/cell_tracer.py
+    TRACE_PATH = os.getenv("WRAPPED_TRACE")
+
+    tracer = None
+    if TRACE_PATH:
+        from cell_tracer import CellTracer as _CellTracer
+
+        tracer = _CellTracer(TRACE_PATH)
+        tracer.install()
+    return TRACE_PATH, tracer
+
+
+@app.cell
+def diary_loader(date, pl):
+    def load_diary(source, year=None):
+        """
+        Lazily scans a Letterboxd diary.csv, optionally keeping only the
+        entries watched in `year`.
+
+        Dates are parsed by the reader itself, so the year filter is pushed
+        down into the scan instead of running on the whole diary. Rating is
+        always Float64, even when the first rows of the diary are unrated.
+
+        Args:
+            source: Path, URL or raw bytes of the diary.csv file.
+            year: Only keep this watched year; None keeps every year.
+        """
+        diary = pl.scan_csv(
+            source,
+            schema_overrides={"Date": pl.Date, "Watched Date": pl.Date, "Rating": pl.Float64},
+        )
+        if year is None:
+            return diary
+        return diary.filter(
+            pl.col("Watched Date").is_between(date(year, 1, 1), date(year, 12, 31))
+        )
+    return (load_diary,)
+
+
+@app.cell
+def _():
+    # the year shown first; every year of the diary can be selected
+    WRAPPED_YEAR = 2024
+    return (WRAPPED_YEAR,)
+
+
+@app.cell
+def zip_loader(io, load_diary, pl, zipfile):
+    # export members loaded from the upload, by frame name
+    EXPORT_FILES = {
+        "diary": "diary.csv",
+        "ratings": "ratings.csv",
+        "watched": "watched.csv",
+        "reviews": "reviews.csv",
+    }
+    EXPORT_SCHEMA = {"Date": pl.Date, "Watched Date": pl.Date, "Rating": pl.Float64}
+
+    # zip bomb guards: uncompressed bytes per member, for the whole export,
+    # and the largest compression ratio a member may have
+    MAX_MEMBER_SIZE = 64 * 1024 * 1024
+    MAX_EXPORT_SIZE = 256 * 1024 * 1024
+    MAX_RATIO = 100
+    CHUNK_SIZE = 1024 * 1024
+
+    def record_boundary(data):
+        """
+        Returns the offset just past the last complete CSV record in `data`,
+        skipping newlines that sit inside quoted fields (e.g. multi-line reviews).
+        """
+        cut = data.rfind(b"\n") + 1
+        while cut and data.count(b'"', 0, cut) % 2:
+            cut = data.rfind(b"\n", 0, cut - 1) + 1
+        return cut
+
+    def read_member(zf, info, parse, budget):
+        """
+        Inflates a zip member CHUNK_SIZE bytes at a time and parses every
+        chunk of complete records as soon as it is available, so neither the
+        decompressed file nor a full untyped frame is ever held in memory.
+        The limits are checked against the bytes actually inflated, not only
+        the sizes the zip header claims.
+
+        Returns:
+            tuple: The parsed frame and the number of bytes inflated.
+        """
+        limit = min(MAX_MEMBER_SIZE, budget, MAX_RATIO * max(info.compress_size, 1))
+        if info.file_size > limit:
+            raise ValueError(f"'{info.filename}' is too large to be a Letterboxd export")
+
+        frames = []
+        inflated = 0
+        with zf.open(info) as src:
+            header = src.readline()
+            pending = b""
+            while chunk := src.read(CHUNK_SIZE):
+                inflated += len(chunk)
+                if inflated > limit:
+                    raise ValueError(f"'{info.filename}' is too large to be a Letterboxd export")
+                pending += chunk
+                cut = record_boundary(pending)
+                if cut:
+                    frames.append(parse(header + pending[:cut]))
+                    pending = pending[cut:]
+            if pending.strip() or not frames:
+                frames.append(parse(header + pending))
+        return pl.concat(frames, how="vertical_relaxed", rechunk=False), inflated + len(header)
+
+    def process_zip_and_load_csv(file_contents, year=None):
+        """
+        Loads the diary, ratings, watched and reviews CSVs of a Letterboxd
+        export in one pass over the zip.
+
+        Args:
+            file_contents: The zip as bytes, or a path to it.
+            year: Only keep the diary entries watched in this year; None
+                keeps every year.
+
+        Returns:
+            dict: Typed Polars DataFrames keyed by EXPORT_FILES names; only
+            "diary" is required to be in the export.
+        """
+        if isinstance(file_contents, bytes):
+            file_contents = io.BytesIO(file_contents)
+
+        parsers = {
+            "diary": lambda data: load_diary(data, year).collect(),
+        }
+        default_parser = lambda data: pl.read_csv(data, schema_overrides=EXPORT_SCHEMA)
+
+        frames = {}
+        budget = MAX_EXPORT_SIZE
+        with zipfile.ZipFile(file_contents) as zf:
             print(zf.namelist())
-            if "diary.csv" in zf.namelist():
-                with zf.open("diary.csv") as csv_file:
-                    df = pl.read_csv(csv_file).filter(
-                        (pl.col("Watched Date") > pl.lit("2024-01-01"))
-                        & (pl.col("Watched Date") < pl.lit("2025-01-01"))
-                    )
-                    return df
-            else:
+            members = {info.filename: info for info in zf.infolist()}
+            if "diary.csv" not in members:
                 raise FileNotFoundError("'diary.csv' not found")
-    return (process_zip_and_load_csv,)
+
+            for name, filename in EXPORT_FILES.items():
+                if filename in members:
+                    parse = parsers.get(name, default_parser)
+                    frames[name], inflated = read_member(zf, members[filename], parse, budget)
+                    budget -= inflated
+        return frames
+    return (
+        CHUNK_SIZE,
+        EXPORT_FILES,
+        EXPORT_SCHEMA,
+        MAX_EXPORT_SIZE,
+        MAX_MEMBER_SIZE,
+        MAX_RATIO,
+        process_zip_and_load_csv,
+        read_member,
+        record_boundary,
+    )
 
 
 @app.cell
-def _(requests):
-    def get_movie_data(title, year, api_key):
-        parsed_title = title.replace(" ", "+")
+def _(os):
+    # point OMDB_API_URL at scripts/omdb_stub.py to enrich offline
+    OMDB_API_URL = os.getenv("OMDB_API_URL", "https://www.omdbapi.com/")
+
+    # number of parallel OMDb requests used to enrich the diary
+    OMDB_WORKERS = 8
+    return OMDB_API_URL, OMDB_WORKERS
 
-        url = f"https://www.omdbapi.com/?&t={parsed_title}&y={year}&apikey={api_key}"
 
-        response = requests.get(url)
+@app.cell
+def omdb_client(OMDB_API_URL, normalize_payload, requests, time, tracer):
+    def get_movie_data(title, year, api_key):
+        start = time.perf_counter()
+        response = requests.get(
+            OMDB_API_URL, params={"t": title, "y": year, "apikey": api_key}
+        )
         data = response.json()
+        ok = response.status_code == 200 and data.get("Response") == "True"
+        if tracer is not None:
+            tracer.omdb_call(start, ok)
 
-        if response.status_code == 200 and data.get("Response") == "True":
-            return data
-        else:
+        if not ok:
             print(f"Errore: {data.get('Error')}")
             return None
+        return normalize_payload(data)
     return (get_movie_data,)
 
 
 @app.cell
-def _(get_movie_data):
-    def get_metatadata(diary_df, api_key):
-        metadata = {}
+def omdb_enrichment(OMDB_WORKERS, get_movie_data, sys):
+    def get_metatadata(diary_df, api_key, max_workers=OMDB_WORKERS):
+        # one request per distinct movie, keyed in diary order
+        movies = {}
         for t, y in diary_df[['Name', 'Year']].rows():
+            movies.setdefault(f"{t}_{y}", (t, y))
+
+        def fetch(movie):
+            t, y = movie
             print(f"Getting data for {t} ({y})")
-            metadata[f"{t}_{y}"] = get_movie_data(t, y, api_key)
-        return metadata
+            return get_movie_data(t, y, api_key)
+
+        # Pyodide can't start threads, so the WASM build fetches sequentially
+        if max_workers <= 1 or sys.platform == "emscripten":
+            results = map(fetch, movies.values())
+            return dict(zip(movies, results))
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            results = pool.map(fetch, movies.values())
+            return dict(zip(movies, results))
     return (get_metatadata,)
 
 
@@ -124,8 +301,8 @@ def _(mo):
 @app.cell
 def _(mo):
     mo.md(
-        f"""
-        Upload your export data from Letterboxd. You need to have your diary filled. **2024** data will be extracted
+        """
+        Upload your export data from Letterboxd. You need to have your diary filled. Every year is extracted, pick the one to show below
         """
     ).style({"text-align": "center"})
     return
@@ -166,15 +343,14 @@ def _(file, pl, process_zip_and_load_csv):
     df = pl.DataFrame()
 
     if file.name():
-        df = process_zip_and_load_csv(file.contents())
+        df = process_zip_and_load_csv(file.contents())["diary"]
     return (df,)
 
 
 @app.cell
-def _(df, pl):
+def diary_format(df, pl):
     df_fmt = df.with_columns(
-        pl.col('Date').str.to_datetime('%Y-%m-%d'), 
-        pl.col('Watched Date').str.to_datetime('%Y-%m-%d'),
+        pl.col('Watched Date').dt.year().alias('Watched Year'),
         pl.concat_str(
             [pl.col('Name'), pl.col('Year')], separator='_').alias('title_year')
     )
@@ -250,151 +426,904 @@ def _(df_full, mo):
 
 
 @app.cell
-def _(API_KEY, df_fmt, get_metatadata, pl):
-    def extract_metadata(cache, title_year, param):
-        temp_metadata = []
-        for ty in title_year:
-            temp_data = cache.get(ty)
-            if temp_data is not None:
-                temp_metadata.append(cache.get(ty)[param])
+def poster_bundle(json, os, sys):
+    # poster thumbnails as data URIs, see scripts/poster_cache.py; the WASM
+    # export ships no bundle, so it links posters from OMDb instead
+    POSTER_BUNDLE = None if sys.platform == "emscripten" else "posters.json"
+
+    def load_poster_bundle(path):
+        """
+        Poster URL -> thumbnail data URI, empty if the bundle was not built
+        or `path` is None.
+        """
+        if path is not None and os.path.exists(path):
+            with open(path, 'r') as f:
+                return json.load(f)
+        return {}
+
+    posters = load_poster_bundle(POSTER_BUNDLE)
+
+    def poster_src(url):
+        # posters missing from the bundle are still linked from OMDb
+        return posters.get(url, url)
+    return POSTER_BUNDLE, load_poster_bundle, poster_src, posters
+
+
+@app.cell
+def title_index(defaultdict, re, threading):
+    class TitleIndex:
+        """
+        Offline resolver from diary titles to movies already in the cache.
+
+        Titles are normalized (case, accents, punctuation, a leading article)
+        and indexed by character trigrams, so "Amélie" finds "Amelie" and
+        "Spider-Man: Into the Spider-Verse" finds "Spider Man Into the
+        Spider-Verse". Release years differ between Letterboxd and OMDb, so
+        a match may be `year_window` years off. Titles whose numbers differ
+        never match, which keeps sequels apart.
+
+        The index is built from `source()`, a `{title_year: payload}` mapping,
+        on the first lookup.
+        """
+
+        ARTICLES = re.compile(r"^(the|a|an) ")
+
+        def __init__(self, source, threshold=0.8, year_window=1):
+            self.source = source
+            self.threshold = threshold
+            self.year_window = year_window
+            self.resolved = 0
+            self.unresolved = 0
+            self._movies = None
+            self._lock = threading.RLock()
+
+        @classmethod
+        def normalize(cls, title):
+            import unicodedata
+
+            text = unicodedata.normalize("NFKD", str(title))
+            text = "".join(c for c in text if not unicodedata.combining(c)).casefold()
+            text = text.replace("&", " and ")
+            text = " ".join(re.sub(r"[\W_]+", " ", text).split())
+            return cls.ARTICLES.sub("", text)
+
+        @staticmethod
+        def trigrams(text):
+            padded = f"  {text} "
+            return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+        @staticmethod
+        def parse_year(year):
+            match = re.match(r"\d{4}", str(year))
+            return int(match.group()) if match else None
+
+        def _build(self):
+            self._movies = []
+            self._exact = defaultdict(list)
+            self._postings = defaultdict(list)
+            self._imdb_ids = set()
+            for key, payload in self.source().items():
+                title, _, year = key.rpartition("_")
+                self.add(key, title, year, (payload or {}).get("imdbID"))
+
+        def add(self, key, title, year, imdb_id=None):
+            """Indexes the cached movie stored under `key`, once per imdbID."""
+            with self._lock:
+                if self._movies is None or (imdb_id and imdb_id in self._imdb_ids):
+                    return
+                self._imdb_ids.add(imdb_id)
+                normalized, year = self.normalize(title), self.parse_year(year)
+                grams = self.trigrams(normalized)
+                movie = len(self._movies)
+                self._movies.append((key, normalized, year, len(grams)))
+                self._exact[normalized].append(movie)
+                # postings per year, so a lookup only scans its year window
+                for gram in grams:
+                    self._postings[gram, year].append(movie)
+
+        def _in_window(self, movie, year):
+            movie_year = self._movies[movie][2]
+            if year is None or movie_year is None:
+                return year == movie_year
+            return abs(movie_year - year) <= self.year_window
+
+        def lookup(self, title, year):
+            """Cache key of the movie `title` (`year`) resolves to, or None."""
+            with self._lock:
+                if self._movies is None:
+                    self._build()
+                normalized, year = self.normalize(title), self.parse_year(year)
+
+                candidates = [
+                    (1.0, m) for m in self._exact.get(normalized, []) if self._in_window(m, year)
+                ]
+                if not candidates:
+                    grams = self.trigrams(normalized)
+                    years = (
+                        [None] if year is None
+                        else range(year - self.year_window, year + self.year_window + 1)
+                    )
+                    shared = defaultdict(int)
+                    for gram in grams:
+                        for movie_year in years:
+                            for movie in self._postings.get((gram, movie_year), ()):
+                                shared[movie] += 1
+                    numbers = re.findall(r"\d+", normalized)
+                    for movie, count in shared.items():
+                        _, other, _, other_grams = self._movies[movie]
+                        # Dice coefficient of the two trigram sets
+                        similarity = 2 * count / (len(grams) + other_grams)
+                        if (
+                            similarity >= self.threshold
+                            and self._in_window(movie, year)
+                            and re.findall(r"\d+", other) == numbers
+                        ):
+                            candidates.append((similarity, movie))
+
+                if not candidates:
+                    self.unresolved += 1
+                    return None
+                self.resolved += 1
+                _, movie = max(
+                    candidates,
+                    key=lambda c: (c[0], -abs((self._movies[c[1]][2] or 0) - (year or 0))),
+                )
+                return self._movies[movie][0]
+
+        def stats(self):
+            return {"resolved": self.resolved, "unresolved": self.unresolved}
+    return (TitleIndex,)
+
+
+@app.cell
+def metadata_fields(pl, re):
+    # the OMDb fields the analysis reads, typed as they are stored in the cache
+    METADATA_SCHEMA = {
+        "Genre": pl.List(pl.String),
+        "Runtime": pl.Int64,
+        "Director": pl.String,
+        "Writer": pl.List(pl.String),
+        "Actors": pl.List(pl.String),
+        "Country": pl.List(pl.String),
+        "Language": pl.List(pl.String),
+        "Metascore": pl.Int64,
+        "imdbRating": pl.Float64,
+        "Rated": pl.String,
+        "BoxOffice": pl.Int64,
+        "Poster": pl.String,
+    }
+    METADATA_FIELDS = list(METADATA_SCHEMA)
+
+    # how OMDb writes the numeric fields, e.g. "142 min" or "$1,234,567"
+    NUMBER_FORMATS = {
+        "Runtime": (re.compile(r"(\d+) min"), int),
+        "Metascore": (re.compile(r"(\d+)"), int),
+        "imdbRating": (re.compile(r"(\d+(?:\.\d+)?)"), float),
+        "BoxOffice": (re.compile(r"\$(\d[\d,]*)"), lambda v: int(v.replace(",", ""))),
+    }
+
+    def normalize_payload(payload):
+        """
+        Types the METADATA_FIELDS of an OMDb payload as it is fetched.
+
+        OMDb sends every value as a string: runtimes become integer minutes,
+        box office integer dollars, scores numbers, comma-separated fields
+        lists and "N/A" an explicit None. Values that are already typed are
+        kept, so a cached payload can go through it again. A numeric field
+        that is not in the format OMDb uses is reported and stored as None,
+        so the rest of the payload is still cached.
+        """
+        if payload is None:
+            return None
+        normalized = dict(payload)
+        for field, dtype in METADATA_SCHEMA.items():
+            value = payload.get(field)
+            if value == "N/A":
+                value = None
+            elif isinstance(value, str) and field in NUMBER_FORMATS:
+                pattern, parse = NUMBER_FORMATS[field]
+                match = pattern.fullmatch(value)
+                if match is None:
+                    print(
+                        f"Warning: {payload.get('Title')} ({payload.get('Year')}): "
+                        f"unexpected {field} {value!r}, stored as null"
+                    )
+                value = parse(match.group(1)) if match else None
+            elif isinstance(value, str) and dtype == pl.List(pl.String):
+                value = value.split(", ")
+            normalized[field] = value
+        return normalized
+
+    def list_column(values):
+        """
+        A List(String) column from Python lists (None for missing ones).
+
+        Polars ingests one flat column of items several times faster than
+        a Python list per row, so the lists are regrouped by row index.
+        """
+        items = pl.DataFrame(
+            {
+                "row": [i for i, items in enumerate(values) if items for _ in items],
+                "item": [item for items in values if items for item in items],
+            },
+            schema={"row": pl.UInt32, "item": pl.String},
+        ).group_by("row").agg("item")
+        return (
+            pl.DataFrame({"row": pl.int_range(len(values), dtype=pl.UInt32, eager=True)})
+            .join(items, on="row", how="left")
+            .sort("row")["item"]
+        )
+
+    def metadata_frame(cache):
+        """
+        Turns normalized OMDb payloads into a frame with one row per movie
+        and one typed column per OMDb field, ready to be joined on
+        `title_year`.
+        """
+        payloads = {k: v for k, v in cache.items() if v is not None}
+        columns = {"title_year": pl.Series(list(payloads), dtype=pl.String)}
+        for field, dtype in METADATA_SCHEMA.items():
+            values = [p.get(field) for p in payloads.values()]
+            if dtype == pl.List(pl.String):
+                columns[field] = list_column(values)
             else:
-                temp_metadata.append(None)
-        return pl.Series("metadata", temp_metadata)
+                columns[field] = pl.Series(values, dtype=dtype)
+        return pl.DataFrame(columns)
+    return (
+        METADATA_FIELDS,
+        METADATA_SCHEMA,
+        NUMBER_FORMATS,
+        metadata_frame,
+        normalize_payload,
+    )
 
 
-    cache = get_metatadata(df_fmt, API_KEY.value)
-    df_full = df_fmt.with_columns(
-        pl.struct(["title_year"])
-        .map_batches(
-            lambda movie: extract_metadata(
-                cache, movie.struct.field("title_year"), "Genre"
-            )
+@app.cell
+def delta_enrichment(TitleIndex, get_metatadata, metadata_frame, os, pl, tracer):
+    # enriched diary entries of the previous upload, one file per account
+    ENRICHMENT_STATE_DIR = os.getenv(
+        "WRAPPED_STATE_DIR",
+        os.path.join(os.path.expanduser("~"), ".cache", "letterboxd_wrapped", "enrichment"),
+    )
+
+    def account_state_path(diary_df):
+        """
+        The state file of the Letterboxd account that exported `diary_df`.
+
+        Accounts are told apart by the URI of their oldest diary entry:
+        boxd.it links are unique to an entry, and later exports of the same
+        account still start with it. If that entry was deleted since, the
+        state sharing the most entries with `diary_df` is the account's, and
+        it is moved to the new key.
+        """
+        import hashlib
+
+        oldest = diary_df.sort("Date", "Letterboxd URI")["Letterboxd URI"].head(1).to_list()
+        key = hashlib.sha256(str(oldest).encode()).hexdigest()[:16]
+        path = os.path.join(ENRICHMENT_STATE_DIR, f"{key}.parquet")
+        if os.path.exists(path) or not os.path.isdir(ENRICHMENT_STATE_DIR):
+            return path
+
+        uris = diary_df["Letterboxd URI"].unique()
+        best, best_shared = None, 0
+        for name in os.listdir(ENRICHMENT_STATE_DIR):
+            if not name.endswith(".parquet"):
+                continue
+            candidate = os.path.join(ENRICHMENT_STATE_DIR, name)
+            try:
+                shared = pl.read_parquet(candidate, columns=["Letterboxd URI"])[
+                    "Letterboxd URI"
+                ].is_in(uris).sum()
+            except (OSError, pl.exceptions.PolarsError):
+                continue
+            if shared > best_shared:
+                best, best_shared = candidate, shared
+        if best is not None:
+            os.replace(best, path)
+        return path
+
+    def enrich_delta(diary_df, api_key, state_path=None):
+        """
+        Enriches a diary, calling OMDb only for the entries that are new or
+        changed since the previous upload.
+
+        Entries are fingerprinted by `Letterboxd URI` and the `title_year`
+        the lookup is made with: an entry whose URI was enriched last time
+        with the same title and year reuses that metadata, and a new entry
+        of a movie that is already known reuses it too. Entries OMDb could
+        not find are left out of the state, so they are retried next time.
+        New titles that resolve offline to a known movie (see `TitleIndex`)
+        reuse its metadata as well.
+
+        Args:
+            diary_df: The diary, with its `title_year` column.
+            api_key: The OMDb API key.
+            state_path: Parquet file with the entries enriched last time;
+                None uses the account's file in ENRICHMENT_STATE_DIR.
+
+        Returns:
+            pl.DataFrame: The metadata of the diary's movies, keyed by
+            `title_year`.
+        """
+        state_path = state_path or account_state_path(diary_df)
+        entries = diary_df.select("Letterboxd URI", "title_year").unique(
+            "Letterboxd URI", maintain_order=True
         )
-        .str.split(", ")
-        .alias("Genre"),
-        pl.struct(["title_year"])
-        .map_batches(
-            lambda movie: extract_metadata(
-                cache, movie.struct.field("title_year"), "Runtime"
-            )
+        previous = metadata_frame({}).with_columns(
+            pl.lit(None, dtype=pl.String).alias("Letterboxd URI")
         )
-        .alias("Runtime"),
-        pl.struct(["title_year"])
-        .map_batches(
-            lambda movie: extract_metadata(
-                cache, movie.struct.field("title_year"), "Director"
-            )
+        # a state written before the fields were typed is enriched again
+        if os.path.exists(state_path) and pl.read_parquet_schema(state_path) == previous.schema:
+            previous = pl.read_parquet(state_path)
+
+        # only new or changed entries of movies never enriched are fetched
+        known = previous.drop("Letterboxd URI").unique("title_year")
+        changed = entries.join(previous, on=["Letterboxd URI", "title_year"], how="anti")
+        missing = changed.join(known, on="title_year", how="anti")
+
+        # titles spelled differently from a known movie are not fetched again
+        index = TitleIndex(lambda: dict.fromkeys(known["title_year"]))
+        aliases = {}
+        for title_year in missing["title_year"].unique(maintain_order=True):
+            title, _, year = title_year.rpartition("_")
+            match = index.lookup(title, year)
+            if match is not None:
+                aliases[title_year] = match
+        if aliases:
+            resolved = pl.DataFrame(
+                {"title_year": list(aliases), "match": list(aliases.values())}
+            ).join(known.rename({"title_year": "match"}), on="match").drop("match")
+            known = pl.concat([known, resolved.select(known.columns)])
+            missing = missing.filter(~pl.col("title_year").is_in(list(aliases)))
+
+        if tracer is not None:
+            movies = entries["title_year"].n_unique()
+            tracer.cache_lookup(True, movies - missing["title_year"].n_unique())
+            tracer.cache_lookup(False, missing["title_year"].n_unique())
+        print(
+            f"{changed.height} new or changed diary entries, "
+            f"{len(aliases)} resolved offline, "
+            f"{missing['title_year'].n_unique()} movies to fetch"
         )
-        .alias("Director"),
-        pl.struct(["title_year"])
-        .map_batches(
-            lambda movie: extract_metadata(
-                cache, movie.struct.field("title_year"), "Writer"
-            )
+
+        fetched = metadata_frame(get_metatadata(
+            diary_df.join(missing, on="Letterboxd URI", how="semi"), api_key
+        ))
+        metadata = pl.concat([
+            known.join(entries, on="title_year", how="semi"),
+            fetched,
+        ])
+
+        state = entries.join(metadata, on="title_year", how="inner")
+        os.makedirs(os.path.dirname(os.path.abspath(state_path)), exist_ok=True)
+        state.select(previous.columns).write_parquet(f"{state_path}.tmp")
+        os.replace(f"{state_path}.tmp", state_path)
+        return metadata
+    return ENRICHMENT_STATE_DIR, account_state_path, enrich_delta
+
+
+@app.cell
+def full_dataframe(API_KEY, df_fmt, enrich_delta, pl):
+    metadata = enrich_delta(df_fmt, API_KEY.value)
+    # names repeat across movies and diary entries, so they are stored as
+    # Categorical: each row holds a u32 into one string table. The fields
+    # were typed when fetched, so nothing is parsed here
+    df_full = (
+        df_fmt.join(
+            metadata.with_columns(
+                pl.col("Genre", "Writer", "Actors", "Country", "Language").cast(
+                    pl.List(pl.Categorical)
+                ),
+                pl.col("Director", "Rated").cast(pl.Categorical),
+            ),
+            on="title_year",
+            how="left",
         )
-        .str.split(", ")
-        .alias("Writer"),
-        pl.struct(["title_year"])
-        .map_batches(
-            lambda movie: extract_metadata(
-                cache, movie.struct.field("title_year"), "Actors"
+        .rename({"Runtime": "Runtime_normalized"})
+        .with_columns(pl.col("Name").cast(pl.Categorical))
+    )
+
+    df_full = df_full.with_columns(
+        (pl.col("Metascore") * 5 / 100).alias("Normalized_Metascore"),
+        (pl.col("imdbRating") * 5 / 10).alias("Normalized_IMDB"),
+        (pl.col("Rating") - pl.col("Metascore") * 5 / 100)
+        .abs()
+        .alias("Rating_Difference_Metascore"),
+        (pl.col("Rating") - pl.col("imdbRating") * 5 / 10)
+        .abs()
+        .alias("Rating_Difference_IMDB"),
+    )
+
+    df_full = df_full.with_columns(
+        (pl.col("Rating") / pl.col("BoxOffice")).alias("RatingPerEarning"),
+    )
+    return df_full, metadata
+
+
+@app.cell
+def top_k(pl):
+    def top_from_lists(df, columns, k=5, by=None):
+        """
+        Most common items of several list columns, computed in one pass.
+
+        Ties keep the order in which items first appear in the diary, like
+        `Counter.most_common`.
+
+        Args:
+            df (pl.DataFrame): frame with the list columns
+            columns (list): names of the list columns
+            k (int): number of items to keep per column
+            by (str): optional column to compute the top-k per value of
+
+        Returns:
+            dict: column -> list of (item, count) tuples, most common first;
+            with `by`, one such dict per value of the `by` column
+        """
+        keys = [by] if by else []
+        lazy = df.lazy()
+        queries = []
+        for column in columns:
+            counts = (
+                lazy.select(*keys, pl.col(column))
+                .explode(column)
+                .drop_nulls(column)
+                .group_by(*keys, column, maintain_order=True)
+                .len()
+                .sort("len", descending=True, maintain_order=True)
             )
-        )
-        .str.split(", ")
-        .alias("Actors"),
-        pl.struct(["title_year"])
-        .map_batches(
-            lambda movie: extract_metadata(
-                cache, movie.struct.field("title_year"), "Country"
+            queries.append(counts.group_by(by, maintain_order=True).head(k) if by else counts.head(k))
+        tops = pl.collect_all(queries)
+        if not by:
+            return {column: list(top.iter_rows()) for column, top in zip(columns, tops)}
+
+        by_value = {value: {column: [] for column in columns} for value in df[by].unique()}
+        for column, top in zip(columns, tops):
+            for (value,), part in top.partition_by(by, as_dict=True, include_key=False).items():
+                by_value[value][column] = list(part.iter_rows())
+        return by_value
+    return (top_from_lists,)
+
+
+@app.cell
+def _(df_full, top_from_lists):
+    top_lists_by_year = top_from_lists(
+        df_full, ["Genre", "Actors", "Writer", "Country", "Language"], k=10,
+        by="Watched Year",
+    )
+    return (top_lists_by_year,)
+
+
+@app.cell
+def wrapped_stats(cached_property, pl):
+    class WrappedStats:
+        """
+        Aggregates of `df_full` shared by the insight cells.
+
+        Each aggregate is computed on first access and memoized, so the text,
+        the charts and the accordions built on the same group-by reuse it.
+        """
+
+        def __init__(self, df_full):
+            self.df = df_full
+
+        @cached_property
+        def total_movies(self):
+            return self.df.select('Name').count().item()
+
+        @cached_property
+        def unique_directors(self):
+            return self.df.select('Director').n_unique()
+
+        @cached_property
+        def director_counts(self):
+            return (
+                self.df.group_by("Director", maintain_order=True)
+                .agg(pl.col("Name").count().alias("count"))
+                .sort("count", descending=True, maintain_order=True)
             )
-        )
-        .str.split(", ")
-        .alias("Country"),
-        pl.struct(["title_year"])
-        .map_batches(
-            lambda movie: extract_metadata(
-                cache, movie.struct.field("title_year"), "Language"
+
+        @cached_property
+        def total_runtime(self):
+            return int(self.df.select('Runtime_normalized').sum().item() / 60)
+
+        @cached_property
+        def month_hours(self):
+            return (
+                self.df.sort("Watched Date")
+                .group_by_dynamic("Watched Date", every="1mo")
+                .agg(pl.col("Runtime_normalized").sum() / 60)
+                .with_columns(
+                    pl.col("Watched Date").dt.strftime("%B").alias("Month"),
+                    pl.col("Runtime_normalized").cast(pl.Int32).alias("Hours"),
+                )
             )
-        )
-        .str.split(", ")
-        .alias("Language"),
-        pl.struct(["title_year"])
-        .map_batches(
-            lambda movie: extract_metadata(
-                cache, movie.struct.field("title_year"), "Metascore"
+
+        @cached_property
+        def busiest_months(self):
+            return self.month_hours.sort(
+                "Runtime_normalized", descending=True, maintain_order=True
             )
-        )
-        .str.to_integer(strict=False)
-        .alias("Metascore"),
-        pl.struct(["title_year"])
-        .map_batches(
-            lambda movie: extract_metadata(
-                cache, movie.struct.field("title_year"), "imdbRating"
+
+        @cached_property
+        def rated_counts(self):
+            return (
+                self.df.group_by("Rated", maintain_order=True)
+                .agg(pl.col("Name").count().alias("count"))
+                .sort("count", descending=True, maintain_order=True)
+            )
+
+        @classmethod
+        def by_year(cls, df_full):
+            """
+            Stats of every `Watched Year` in `df_full`, keyed by year.
+
+            Each aggregate runs once over the whole diary with the year as an
+            extra key, then is split into the per-year caches, so switching
+            year does not recompute anything.
+            """
+            def split(frame):
+                return {
+                    year: part
+                    for (year,), part in frame.partition_by(
+                        "Watched Year", as_dict=True, include_key=False
+                    ).items()
+                }
+
+            def counts(column):
+                return split(
+                    df_full.group_by("Watched Year", column, maintain_order=True)
+                    .agg(pl.col("Name").count().alias("count"))
+                    .sort("count", descending=True, maintain_order=True)
+                )
+
+            totals = df_full.group_by("Watched Year").agg(
+                pl.col("Name").count().alias("total_movies"),
+                pl.col("Director").n_unique().alias("unique_directors"),
+                (pl.col("Runtime_normalized").sum() / 60).cast(pl.Int64).alias("total_runtime"),
+            )
+            director_counts = counts("Director")
+            rated_counts = counts("Rated")
+            month_hours = split(
+                df_full.sort("Watched Date")
+                .group_by_dynamic("Watched Date", every="1mo")
+                .agg(pl.col("Runtime_normalized").sum() / 60)
+                .with_columns(
+                    pl.col("Watched Date").dt.strftime("%B").alias("Month"),
+                    pl.col("Runtime_normalized").cast(pl.Int32).alias("Hours"),
+                    pl.col("Watched Date").dt.year().alias("Watched Year"),
+                )
+            )
+
+            by_year = {}
+            for (year,), part in df_full.partition_by("Watched Year", as_dict=True).items():
+                stats = cls(part)
+                stats.__dict__.update(
+                    totals.filter(pl.col("Watched Year") == year).drop("Watched Year").row(0, named=True),
+                    director_counts=director_counts[year],
+                    rated_counts=rated_counts[year],
+                    month_hours=month_hours[year],
+                )
+                by_year[year] = stats
+            return by_year
+    return (WrappedStats,)
+
+
+@app.cell
+def _(WrappedStats, df_full):
+    stats_by_year = WrappedStats.by_year(df_full)
+    return (stats_by_year,)
+
+
+@app.cell
+def figures(pl):
+    # plotly is imported by the builders, so it only loads when a chart renders
+
+    # line charts with more points than this use WebGL instead of SVG
+    WEBGL_THRESHOLD = 1_000
+    # and time series are binned on the Polars side down to this many points
+    MAX_POINTS = 2_000
+
+    def downsample(df, x, y, max_points=MAX_POINTS):
+        """
+        Bins a series to at most `max_points` rows before it is plotted.
+
+        Each bin keeps the minimum and the maximum of `y` at its first `x`,
+        so peaks survive the binning.
+        """
+        if max_points is None or df.height <= max_points:
+            return df
+        size = -(-df.height // (max_points // 2))
+        return (
+            df.select(x, y)
+            .with_row_index("bin")
+            .with_columns(pl.col("bin") // size)
+            .group_by("bin", maintain_order=True)
+            .agg(
+                pl.col(x).first(),
+                pl.col(y).min().alias("min"),
+                pl.col(y).max().alias("max"),
             )
+            .unpivot(["min", "max"], index=["bin", x], value_name=y)
+            .sort("bin", maintain_order=True)
+            .select(x, y)
+        )
+
+    # serialized figures by builder, arguments and input data
+    figure_json = {}
+
+    def cached_figure(builder, df, *args):
+        """
+        `builder(df, *args)`, rebuilt from the JSON of a previous call with
+        the same inputs instead of running Plotly Express again.
+
+        `df` should only hold the columns the chart plots, as its rows are
+        hashed for the cache key. Categorical columns are hashed by their
+        strings, since their physical codes depend on the string cache.
+        """
+        import hashlib
+        import plotly.io as pio
+
+        values = df.with_columns(
+            pl.col(pl.Categorical).cast(pl.String),
+            pl.col(pl.List(pl.Categorical)).cast(pl.List(pl.String)),
+        )
+        digest = hashlib.sha256(values.hash_rows(seed=0).to_frame().write_ipc(None).getvalue())
+        key = (builder.__name__, args, str(df.schema), digest.hexdigest())
+        if key not in figure_json:
+            if len(figure_json) >= 64:
+                figure_json.pop(next(iter(figure_json)))
+            figure_json[key] = pio.to_json(builder(df, *args), validate=False)
+        return pio.from_json(figure_json[key])
+
+    def directors_figure(director_counts):
+        """
+        Creates a horizontal bar chart of the movies watched per director.
+
+        Args:
+            director_counts: Polars DataFrame with "Director" and "count" columns.
+        """
+        import plotly.express as px
+
+        directors = director_counts["Director"].to_list()
+        counts = director_counts["count"].to_list()
+
+        fig = px.bar(
+            x=counts,  
+            y=directors,  
+            labels={"x": "Number of Movies", "y": "Director"},
+            title="Number of Movies by Director",
+            color=directors, 
+            color_discrete_sequence=px.colors.qualitative.Pastel,
+        )
+
+        # Personalizza il grafico
+        fig.update_layout(
+            xaxis_title="Number of Movies",
+            yaxis_title="",
+            title_font_size=16,
+            title_font_weight="bold",
+            xaxis_tickfont_size=12,
+            yaxis_tickfont_size=12,
+            margin=dict(l=0, r=0, t=40, b=40),
+            yaxis=dict(autorange="reversed"),
+            showlegend=False,
+        )
+
+        return fig
+
+    def hours_per_month_figure(month_hour_list, max_points=MAX_POINTS):
+        """
+        Creates an interactive line chart for hours worked per month.
+
+        Long series are binned to `max_points` (None keeps every point) and
+        drawn with WebGL above WEBGL_THRESHOLD points.
+
+        Args:
+            month_hour_list: Polars DataFrame containing "Month" and "Hours" columns.
+            max_points: Upper bound on the plotted points.
+        """
+        import plotly.express as px
+
+        plot_data = downsample(month_hour_list, "Month", "Hours", max_points)
+        large = plot_data.height > WEBGL_THRESHOLD
+
+        # Create the Plotly line chart
+        fig = px.line(
+            plot_data,
+            x="Month",
+            y="Hours",
+            markers=not large,  # Add circular markers
+            title="Hours per Month",
+            labels={"Month": "Months", "Hours": "Hours"},  # Axis labels
+            line_shape="linear",  # Line interpolation
+            render_mode="webgl" if large else "svg",
+        )
+
+        # Customize the chart
+        fig.update_traces(
+            line=dict(width=2.5, color=px.colors.qualitative.Pastel[0]),  # Line color and thickness
+            marker=dict(size=10, symbol="circle", color=px.colors.qualitative.Pastel[0]),  # Marker size and color
+        )
+        fig.update_layout(
+            title_font_size=14,
+            title_font_weight="bold",
+            xaxis=dict(
+                title_font=dict(size=12),
+                tickangle=45,  # Rotate x-axis labels
+                tickfont=dict(size=12),
+            ),
+            yaxis=dict(
+                title_font=dict(size=12),
+                tickfont=dict(size=12),
+            ),
+            margin=dict(l=20, r=20, t=50, b=40),  # Adjust margins
+            plot_bgcolor="white",  # Set background color
+        )
+        fig.update_xaxes(showgrid=True, gridcolor="lightgrey")
+        fig.update_yaxes(showgrid=True, gridcolor="lightgrey")
+
+        return fig
+
+    def top_scores_figure(df, column_name):
+        """
+        Creates an interactive bar chart for the top 10 movies based on a given column (e.g., 'Metascore' or 'imdbRating').
+
+        Args:
+        - df: Polars DataFrame containing movie data.
+        - column_name: Column name to be used for the plot (e.g., 'Metascore' or 'imdbRating').
+        """
+        import plotly.express as px
+
+        plot_data = (
+            df.select("Name", column_name)
+            .drop_nulls()
+            .sort(column_name, descending=True)
+            .head(10)
+        )
+
+        movie_titles = plot_data["Name"].to_list()
+        scores = plot_data[column_name].to_list()
+
+        fig = px.bar(
+            x=movie_titles,
+            y=scores,
+            text=scores,
+            labels={"x": "Movie", "y": column_name.capitalize()},
+            title=f"Top 10 {column_name.capitalize()} Scores",
+            color=scores,
+            color_continuous_scale=px.colors.sequential.Teal,
+        )
+
+        fig.update_traces(
+            texttemplate="%{text}",  # Format text as the score
+            textposition="outside",  # Display text above the bars
+        )
+        fig.update_layout(
+            xaxis_title="Movie",
+            yaxis_title=column_name.capitalize(),
+            title_font_size=16,
+            title_font_weight="bold",
+            xaxis_tickangle=45,  
+            xaxis_tickfont=dict(size=12, family="Serif"),
+            yaxis_tickfont=dict(size=12, family="Serif"),
+            margin=dict(l=10, r=10, t=50, b=40),
+        )
+
+        return fig
+
+    def rating_differences_figure(df, rating_diff_col, normalized_col, title_suffix=""):
+        """
+        Creates an interactive bar chart comparing your ratings vs critic ratings for the top 10 movies based on a rating difference column.
+
+        Args:
+            df: The Polars DataFrame containing the data.
+            rating_diff_col: The column representing the difference between your rating and the critic's.
+            normalized_col: The column representing the normalized critic rating.
+            title_suffix: A string to append to the plot title (e.g., "Metascore" or "IMDB").
+        """
+        import plotly.express as px
+
+        # Prepare the data
+        plot_data = (
+            df.select(["Name", rating_diff_col, "Rating", normalized_col])
+            .drop_nulls()
+            .sort(rating_diff_col, descending=True)
+            .head(10)
         )
-        .str.to_decimal().cast(pl.Float64)
-        .alias("imdbRating"),
-        pl.struct(["title_year"])
-        .map_batches(
-            lambda movie: extract_metadata(
-                cache, movie.struct.field("title_year"), "Rated"
-            )
+
+        # Extract data into lists for plotting
+        names = plot_data["Name"].to_list()
+        ratings = plot_data["Rating"].to_list()
+        normalized_ratings = plot_data[normalized_col].to_list()
+
+        # Prepare data for side-by-side plotting
+        categories = ["Your Rating"] * len(ratings) + ["Critic Rating"] * len(normalized_ratings)
+        scores = ratings + normalized_ratings
+        movie_labels = names * 2  # Repeat names for both groups
+
+        # Create a DataFrame for Plotly
+        plotly_data = pl.DataFrame({
+            "Movie": movie_labels,
+            "Rating Type": categories,
+            "Score": scores,
+        })
+
+        # Create the Plotly bar chart
+        fig = px.bar(
+            plotly_data,
+            x="Movie",
+            y="Score",
+            color="Rating Type",
+            barmode="group",  # Group bars side by side
+            text="Score",  # Display score values on the bars
+            labels={"Score": "Rating", "Movie": "Movie"},
+            title=f"Your Rating vs Critic Rating ({title_suffix})",
+            color_discrete_sequence=px.colors.qualitative.Pastel
         )
-        .alias("Rated"),
-        pl.struct(["title_year"])
-        .map_batches(
-            lambda movie: extract_metadata(
-                cache, movie.struct.field("title_year"), "BoxOffice"
-            )
+
+        # Customize the chart
+        fig.update_traces(
+            texttemplate="%{text:.1f}",  # Format text values
+            textposition="outside",  # Place text outside the bars
         )
-        .alias("BoxOffice"),
-        pl.struct(["title_year"])
-        .map_batches(
-            lambda movie: extract_metadata(
-                cache, movie.struct.field("title_year"), "Poster"
-            )
+        fig.update_layout(
+            title_font_size=16,
+            title_font_weight="bold",
+            xaxis_tickangle=45,  # Rotate x-axis labels
+            xaxis_tickfont=dict(size=12, family="Serif"),
+            yaxis_tickfont=dict(size=12, family="Serif"),
+            legend=dict(
+                title="Rating Type",
+                orientation="h",
+                yanchor="bottom",
+                y=1,
+                xanchor="center",
+                x=0.5,
+            ),
+            margin=dict(l=10, r=10, t=50, b=40),
         )
-        .alias("Poster"),
-    )
-
-    df_full = df_full.with_columns(
-        pl.col("Runtime")
-        .str.replace(" min", "")
-        .str.to_integer()
-        .alias("Runtime_normalized"),
-        (pl.col("Metascore") * 5 / 100).alias("Normalized_Metascore"),
-        (pl.col("imdbRating") * 5 / 10).alias("Normalized_IMDB"),
-        (pl.col("Rating") - pl.col("Metascore") * 5 / 100)
-        .abs()
-        .alias("Rating_Difference_Metascore"),
-        (pl.col("Rating") - pl.col("imdbRating") * 5 / 10)
-        .abs()
-        .alias("Rating_Difference_IMDB"),
-        pl.col("BoxOffice")
-        .str.replace_all(r"[\$,]", "")
-        .str.to_integer(strict=False)
-        .alias("BoxOffice"),
-    )
 
-    df_full = df_full.with_columns(
-        (pl.col("Rating") / pl.col("BoxOffice")).alias("RatingPerEarning"),
+        return fig
+    return (
+        MAX_POINTS,
+        WEBGL_THRESHOLD,
+        cached_figure,
+        directors_figure,
+        downsample,
+        figure_json,
+        hours_per_month_figure,
+        rating_differences_figure,
+        top_scores_figure,
     )
-    return cache, df_full, extract_metadata
 
 
 @app.cell
-def _(Counter):
-    def get_top_from_list(df, column, top=5):
-        items = []
-        for item_list in df.select(column).rows():
-            if item_list[0]:
-                for i in item_list[0]:
-                    items.append(i)
+def _(WRAPPED_YEAR, mo, stats_by_year):
+    # years without any OMDb metadata have nothing to show
+    wrapped_years = [
+        str(year)
+        for year, year_stats in sorted(stats_by_year.items())
+        if year_stats.total_runtime
+    ]
+    mo.stop(
+        not wrapped_years,
+        mo.md("**No year has OMDb metadata yet**, so there is nothing to wrap."),
+    )
+    year_select = mo.ui.dropdown(
+        options=wrapped_years,
+        value=str(WRAPPED_YEAR) if str(WRAPPED_YEAR) in wrapped_years else wrapped_years[-1],
+        label="Wrapped year",
+    )
+    mo.center(year_select)
+    return wrapped_years, year_select
 
-        item_counts = Counter(items)
 
-        return item_counts.most_common(top)
-    return (get_top_from_list,)
+@app.cell
+def _(stats_by_year, top_lists_by_year, year_select):
+    stats = stats_by_year[int(year_select.value)]
+    top_lists = top_lists_by_year[int(year_select.value)]
+    df_year = stats.df
+    return df_year, stats, top_lists
 
 
 @app.cell
@@ -419,13 +1348,13 @@ def _(mo):
 
 
 @app.cell
-def _(df_full, mo, number_unique_directors, pl, total_movies_watched):
+def _(mo, number_unique_directors, stats, total_movies_watched):
     mo.center(
         mo.md(
             f"""
         - **Total Movies Watched**: The total number of movies logged -> **{total_movies_watched}**
         - **Unique Directors**: The number of unique directors in the dataset -> **{number_unique_directors}**
-        - **Top Directors**: The directors with the most movies in the dataset. -> **{df_full.group_by('Director').agg(pl.col('Name').count().alias('count')).sort('count', descending=True).select('Director').head(1).item()}**
+        - **Top Directors**: The directors with the most movies in the dataset. -> **{stats.director_counts['Director'][0]}**
         """
         )
     )
@@ -433,62 +1362,28 @@ def _(df_full, mo, number_unique_directors, pl, total_movies_watched):
 
 
 @app.cell
-def _(df_full, mo, pl, px):
-    directors_data = (
-        df_full.group_by("Director")
-        .agg(pl.col("Name").count().alias("count"))
-        .sort("count", descending=True)
-        .head(13)
-    )
-
-    directors = directors_data["Director"].to_list()
-    counts = directors_data["count"].to_list()
-
-    fig = px.bar(
-        x=counts,  
-        y=directors,  
-        labels={"x": "Number of Movies", "y": "Director"},
-        title="Number of Movies by Director",
-        color=directors, 
-        color_discrete_sequence=px.colors.qualitative.Pastel,
-    )
-
-    # Personalizza il grafico
-    fig.update_layout(
-        xaxis_title="Number of Movies",
-        yaxis_title="",
-        title_font_size=16,
-        title_font_weight="bold",
-        xaxis_tickfont_size=12,
-        yaxis_tickfont_size=12,
-        margin=dict(l=0, r=0, t=40, b=40),
-        yaxis=dict(autorange="reversed"),
-        showlegend=False,
-    )
-
-    mo.center(mo.ui.plotly(fig))
-    return counts, directors, directors_data, fig
+def _(cached_figure, directors_figure, mo, stats):
+    mo.center(mo.ui.plotly(cached_figure(directors_figure, stats.director_counts.head(13))))
+    return
 
 
 @app.cell
-def _(df_full):
-    total_movies_watched = df_full.select('Name').count().item()
+def _(stats):
+    total_movies_watched = stats.total_movies
     return (total_movies_watched,)
 
 
 @app.cell
-def _(df_full):
-    number_unique_directors = df_full.select('Director').n_unique()
+def _(stats):
+    number_unique_directors = stats.unique_directors
     return (number_unique_directors,)
 
 
 @app.cell
-def _(df_full, mo, pl):
+def _(mo, stats):
     mo.center(mo.accordion(
         {
-            "Full director list": df_full.group_by("Director")
-            .agg(pl.col("Name").count().alias("count"))
-            .sort("count", descending=True),
+            "Full director list": stats.director_counts,
         }
     ))
     return
@@ -529,26 +1424,26 @@ def _(mo, top_3_longest_movies_stack, total_runtime):
 
 
 @app.cell
-def _(df_full):
-    total_runtime = int(df_full.select('Runtime_normalized').sum().item() / 60)
+def _(stats):
+    total_runtime = stats.total_runtime
     return (total_runtime,)
 
 
 @app.cell
-def _(df_full):
-    top_3_longest_movies = df_full.select('Name', 'Runtime_normalized', 'Poster').drop_nulls().sort('Runtime_normalized', descending=True).select('Name', 'Poster').head(3).to_dicts()
+def _(df_year):
+    top_3_longest_movies = df_year.select('Name', 'Runtime_normalized', 'Poster').drop_nulls().sort('Runtime_normalized', descending=True).select('Name', 'Poster').head(3).to_dicts()
     return (top_3_longest_movies,)
 
 
 @app.cell
-def _(mo, top_3_longest_movies):
+def _(mo, poster_src, top_3_longest_movies):
     top_3_longest_movies_stack = []
     for m in top_3_longest_movies:
         top_3_longest_movies_stack.append(
             mo.md(
                 f"""
             {m['Name']}
-            ![{m['Name']} poster]({m['Poster']})
+            ![{m['Name']} poster]({poster_src(m['Poster'])})
             """
             )
         )
@@ -574,66 +1469,15 @@ def _(mo, top_month):
 
 
 @app.cell
-def _(df_full, pl):
-    month_hour_list = (
-       df_full.group_by_dynamic("Watched Date", every="1mo")
-        .agg(pl.col("Runtime_normalized").sum() / 60)
-        .with_columns(
-            pl.col("Watched Date").dt.strftime("%B").alias("Month"),
-            pl.col("Runtime_normalized").cast(pl.Int32).alias("Hours"),
-        )
-        .select("Month", "Hours")
-    )
+def _(stats):
+    month_hour_list = stats.month_hours.select("Month", "Hours")
     return (month_hour_list,)
 
 
 @app.cell
-def _(mo, px):
+def _(cached_figure, hours_per_month_figure, mo):
     def plot_hours_per_month_plotly(month_hour_list):
-        """
-        Creates an interactive line chart for hours worked per month.
-
-        Args:
-            month_hour_list: Polars DataFrame containing "Month" and "Hours" columns.
-        """
-        # Convert Polars DataFrame to Pandas for Plotly
-        plot_data = month_hour_list
-
-        # Create the Plotly line chart
-        fig = px.line(
-            plot_data,
-            x="Month",
-            y="Hours",
-            markers=True,  # Add circular markers
-            title="Hours per Month",
-            labels={"Month": "Months", "Hours": "Hours"},  # Axis labels
-            line_shape="linear",  # Line interpolation
-        )
-
-        # Customize the chart
-        fig.update_traces(
-            line=dict(width=2.5, color=px.colors.qualitative.Pastel[0]),  # Line color and thickness
-            marker=dict(size=10, symbol="circle", color=px.colors.qualitative.Pastel[0]),  # Marker size and color
-        )
-        fig.update_layout(
-            title_font_size=14,
-            title_font_weight="bold",
-            xaxis=dict(
-                title_font=dict(size=12),
-                tickangle=45,  # Rotate x-axis labels
-                tickfont=dict(size=12),
-            ),
-            yaxis=dict(
-                title_font=dict(size=12),
-                tickfont=dict(size=12),
-            ),
-            margin=dict(l=20, r=20, t=50, b=40),  # Adjust margins
-            plot_bgcolor="white",  # Set background color
-        )
-        fig.update_xaxes(showgrid=True, gridcolor="lightgrey")
-        fig.update_yaxes(showgrid=True, gridcolor="lightgrey")
-
-        return mo.center(mo.ui.plotly(fig))
+        return mo.center(mo.ui.plotly(cached_figure(hours_per_month_figure, month_hour_list)))
     return (plot_hours_per_month_plotly,)
 
 
@@ -644,31 +1488,17 @@ def _(month_hour_list, plot_hours_per_month_plotly):
 
 
 @app.cell
-def _(df_full, pl):
-    top_month = (
-        df_full.group_by_dynamic("Watched Date", every="1mo")
-        .agg(pl.col("Runtime_normalized").sum() / 60)
-        .sort("Runtime_normalized", descending=True)
-        .select("Watched Date")
-        .head(1)
-        .item()
-    )
+def _(stats):
+    top_month = stats.busiest_months["Watched Date"][0]
     return (top_month,)
 
 
 @app.cell
-def _(df_full, mo, pl):
+def _(mo, stats):
     mo.center(
         mo.accordion(
             {
-                "Month list": df_full.group_by_dynamic("Watched Date", every="1mo")
-                .agg(pl.col("Runtime_normalized").sum() / 60)
-                .sort("Runtime_normalized", descending=True)
-                .with_columns(
-                    pl.col("Watched Date").dt.strftime("%B").alias("Month"),
-                    pl.col("Runtime_normalized").cast(pl.Int32).alias("Hours"),
-                )
-                .select("Month", "Hours")
+                "Month list": stats.busiest_months.select("Month", "Hours")
             }
         )
     )
@@ -676,14 +1506,16 @@ def _(df_full, mo, pl):
 
 
 @app.cell
-def _(df_full, pl):
-    top_rated = df_full.group_by('Rated').agg(pl.col('Name').count().alias('count')).sort('count', descending=True).head(1).to_dict()
+def _(stats):
+    top_rated = stats.rated_counts.head(1).to_dict()
     return (top_rated,)
 
 
 @app.cell
-def _(df_full, pl):
-    top_boxoffice = df_full.select('Name','BoxOffice', 'Poster').drop_nulls().sort(pl.col('BoxOffice'), descending=True).select('Name', 'Poster').head(1).to_dicts()[0]
+def _(df_year, pl):
+    _top = df_year.select('Name','BoxOffice', 'Poster').drop_nulls().sort(pl.col('BoxOffice'), descending=True).select('Name', 'Poster').head(1).to_dicts()
+    # None when OMDb has no BoxOffice for any movie of the year
+    top_boxoffice = _top[0] if _top else None
     return (top_boxoffice,)
 
 
@@ -694,15 +1526,15 @@ def _(mo):
 
 
 @app.cell
-def _(df_full, get_top_from_list, mo, top_boxoffice):
+def _(mo, top_boxoffice, top_lists):
     mo.center(
         mo.md(
             f"""
-        - **Top Genres**: The most frequently watched genres.  **{get_top_from_list(df_full, 'Genre', 1)[0][0]}**
-        - **Top Actors**: The actors appearing most often in the movies. **{get_top_from_list(df_full, 'Actors', 1)[0][0]}**
-        - **Top Writers**: The most recurring writers.  **{get_top_from_list(df_full, 'Writer', 1)[0][0]}**
-        - **Top Countries and Languages**: The most common production countries and spoken languages. **{get_top_from_list(df_full, 'Country', 1)[0][0]}** , **{get_top_from_list(df_full, 'Language', 1)[0][0]}**
-        - **BoxOffice sensation**: The highest-grossing movie I watched this year is **{top_boxoffice['Name']}**
+        - **Top Genres**: The most frequently watched genres.  **{top_lists['Genre'][0][0]}**
+        - **Top Actors**: The actors appearing most often in the movies. **{top_lists['Actors'][0][0]}**
+        - **Top Writers**: The most recurring writers.  **{top_lists['Writer'][0][0]}**
+        - **Top Countries and Languages**: The most common production countries and spoken languages. **{top_lists['Country'][0][0]}** , **{top_lists['Language'][0][0]}**
+        - **BoxOffice sensation**: The highest-grossing movie I watched this year is **{top_boxoffice['Name'] if top_boxoffice else 'unknown'}**
         """
         )
     )
@@ -710,8 +1542,9 @@ def _(df_full, get_top_from_list, mo, top_boxoffice):
 
 
 @app.cell
-def _(mo, top_boxoffice):
-    mo.center(mo.md(f"""![{top_boxoffice['Name']} poster]({top_boxoffice['Poster']})"""))
+def _(mo, poster_src, top_boxoffice):
+    mo.stop(top_boxoffice is None)
+    mo.center(mo.md(f"""![{top_boxoffice['Name']} poster]({poster_src(top_boxoffice['Poster'])})"""))
     return
 
 
@@ -728,11 +1561,11 @@ def _(mo, top_rated):
 
 @app.cell
 def _():
-    # get_top_from_list(df_full, 'Genre', 10)
-    # get_top_from_list(df_full, 'Actors', 10)
-    # get_top_from_list(df_full, 'Writer', 10)
-    # get_top_from_list(df_full, 'Country', 10)
-    # get_top_from_list(df_full, 'Language', 10)
+    # top_lists['Genre']
+    # top_lists['Actors']
+    # top_lists['Writer']
+    # top_lists['Country']
+    # top_lists['Language']
     return
 
 
@@ -763,19 +1596,19 @@ def _(mo, top_3_user_rating_stack):
 
 
 @app.cell
-def _(df_full):
-    top_user_rating = df_full.select('Name', 'Rating', 'Poster').drop_nulls().sort('Rating', descending=True).head(3).to_dicts()
+def _(df_year):
+    top_user_rating = df_year.select('Name', 'Rating', 'Poster').drop_nulls().sort('Rating', descending=True).head(3).to_dicts()
     return (top_user_rating,)
 
 
 @app.cell
-def _(mo, top_user_rating):
+def _(mo, poster_src, top_user_rating):
     top_3_user_rating_stack = []
     for mr in top_user_rating:
         top_3_user_rating_stack.append(mo.md(
             f"""
             {mr['Name']}
-            ![{mr['Name']} poster]({mr['Poster']})
+            ![{mr['Name']} poster]({poster_src(mr['Poster'])})
             """
         ))
     return mr, top_3_user_rating_stack
@@ -790,74 +1623,34 @@ def _(mo):
 
 
 @app.cell
-def _(mo, px):
+def _(cached_figure, mo, top_scores_figure):
     def plot_top_scores(df, column_name):
-        """
-        Creates an interactive bar chart for the top 10 movies based on a given column (e.g., 'Metascore' or 'imdbRating').
-
-        Args:
-        - df: Polars DataFrame containing movie data.
-        - column_name: Column name to be used for the plot (e.g., 'Metascore' or 'imdbRating').
-        """
-        plot_data = (
-            df.select("Name", column_name)
-            .drop_nulls()
-            .sort(column_name, descending=True)
-            .head(10)
-        )
-
-        movie_titles = plot_data["Name"].to_list()
-        scores = plot_data[column_name].to_list()
-
-        fig = px.bar(
-            x=movie_titles,
-            y=scores,
-            text=scores,
-            labels={"x": "Movie", "y": column_name.capitalize()},
-            title=f"Top 10 {column_name.capitalize()} Scores",
-            color=scores,
-            color_continuous_scale=px.colors.sequential.Teal,
-        )
-
-        fig.update_traces(
-            texttemplate="%{text}",  # Format text as the score
-            textposition="outside",  # Display text above the bars
-        )
-        fig.update_layout(
-            xaxis_title="Movie",
-            yaxis_title=column_name.capitalize(),
-            title_font_size=16,
-            title_font_weight="bold",
-            xaxis_tickangle=45,  
-            xaxis_tickfont=dict(size=12, family="Serif"),
-            yaxis_tickfont=dict(size=12, family="Serif"),
-            margin=dict(l=10, r=10, t=50, b=40),
-        )
-
-        return mo.center(mo.ui.plotly(fig))
+        return mo.center(mo.ui.plotly(
+            cached_figure(top_scores_figure, df.select("Name", column_name), column_name)
+        ))
     return (plot_top_scores,)
 
 
 @app.cell
-def _(df_full, mo, plot_top_scores):
+def _(df_year, mo, plot_top_scores):
     mo.center(mo.ui.tabs(
         {
-            "Metacritic": plot_top_scores(df_full, "Metascore"),
-            "IMDB": plot_top_scores(df_full, "imdbRating"),
+            "Metacritic": plot_top_scores(df_year, "Metascore"),
+            "IMDB": plot_top_scores(df_year, "imdbRating"),
         }
     ))
     return
 
 
 @app.cell
-def _(df_full, mo):
+def _(df_year, mo):
     mo.center(
         mo.accordion(
             {
-                "Metascore full list": df_full.select("Name", "Metascore")
+                "Metascore full list": df_year.select("Name", "Metascore")
                 .drop_nulls()
                 .sort("Metascore", descending=True),
-                "IMDB full list": df_full.select("Name", "imdbRating")
+                "IMDB full list": df_year.select("Name", "imdbRating")
                 .drop_nulls()
                 .sort("imdbRating", descending=True),
             }
@@ -885,93 +1678,30 @@ def _(mo):
 
 
 @app.cell
-def _(mo, pl, px):
+def _(cached_figure, mo, rating_differences_figure):
     def plot_rating_differences(df, rating_diff_col, normalized_col, title_suffix=""):
-        """
-        Creates an interactive bar chart comparing your ratings vs critic ratings for the top 10 movies based on a rating difference column.
-
-        Args:
-            df: The Polars DataFrame containing the data.
-            rating_diff_col: The column representing the difference between your rating and the critic's.
-            normalized_col: The column representing the normalized critic rating.
-            title_suffix: A string to append to the plot title (e.g., "Metascore" or "IMDB").
-        """
-        # Prepare the data
-        plot_data = (
-            df.select(["Name", rating_diff_col, "Rating", normalized_col])
-            .drop_nulls()
-            .sort(rating_diff_col, descending=True)
-            .head(10)
-        )
-
-        # Extract data into lists for plotting
-        names = plot_data["Name"].to_list()
-        ratings = plot_data["Rating"].to_list()
-        normalized_ratings = plot_data[normalized_col].to_list()
-
-        # Prepare data for side-by-side plotting
-        categories = ["Your Rating"] * len(ratings) + ["Critic Rating"] * len(normalized_ratings)
-        scores = ratings + normalized_ratings
-        movie_labels = names * 2  # Repeat names for both groups
-
-        # Create a DataFrame for Plotly
-        plotly_data = pl.DataFrame({
-            "Movie": movie_labels,
-            "Rating Type": categories,
-            "Score": scores,
-        })
-
-        # Create the Plotly bar chart
-        fig = px.bar(
-            plotly_data,
-            x="Movie",
-            y="Score",
-            color="Rating Type",
-            barmode="group",  # Group bars side by side
-            text="Score",  # Display score values on the bars
-            labels={"Score": "Rating", "Movie": "Movie"},
-            title=f"Your Rating vs Critic Rating ({title_suffix})",
-            color_discrete_sequence=px.colors.qualitative.Pastel
-        )
-
-        # Customize the chart
-        fig.update_traces(
-            texttemplate="%{text:.1f}",  # Format text values
-            textposition="outside",  # Place text outside the bars
-        )
-        fig.update_layout(
-            title_font_size=16,
-            title_font_weight="bold",
-            xaxis_tickangle=45,  # Rotate x-axis labels
-            xaxis_tickfont=dict(size=12, family="Serif"),
-            yaxis_tickfont=dict(size=12, family="Serif"),
-            legend=dict(
-                title="Rating Type",
-                orientation="h",
-                yanchor="bottom",
-                y=1,
-                xanchor="center",
-                x=0.5,
-            ),
-            margin=dict(l=10, r=10, t=50, b=40),
-        )
-
-        return mo.center(mo.ui.plotly(fig))
+        return mo.center(mo.ui.plotly(cached_figure(
+            rating_differences_figure,
+            df.select("Name", rating_diff_col, "Rating", normalized_col),
+            rating_diff_col,
+            normalized_col,
+            title_suffix,
+        )))
     return (plot_rating_differences,)
 
 
 @app.cell
-def _(df_full, mo, plot_rating_differences):
+def _(df_year, mo, plot_rating_differences):
     mo.center(mo.ui.tabs(
         {
             "Metacritic": plot_rating_differences(
-                df=df_full,
+                df=df_year,
                 rating_diff_col="Rating_Difference_Metascore",
                 normalized_col="Normalized_Metascore",
                 title_suffix="Metascore",
             ),
             "IMDB": plot_rating_differences(
-                df=df_full,
+                df=df_year,
                 rating_diff_col="Rating_Difference_IMDB",
                 normalized_col="Normalized_IMDB",
                 title_suffix="IMDB",
@@ -982,11 +1712,11 @@ def _(df_full, mo, plot_rating_differences):
 
 
 @app.cell
-def _(df_full, mo):
+def _(df_year, mo):
     mo.center(
         mo.accordion(
             {
-                "Metascore difference full": df_full.select(
+                "Metascore difference full": df_year.select(
                     "Name",
                     "Rating_Difference_Metascore",
                     "Rating",
@@ -994,7 +1724,7 @@ def _(df_full, mo):
                 )
                 .drop_nulls()
                 .sort("Rating_Difference_Metascore", descending=True),
-                "IMDB difference full": df_full.select(
+                "IMDB difference full": df_year.select(
                     "Name", "Rating_Difference_IMDB", "Rating", "Normalized_IMDB"
                 )
                 .drop_nulls()
@@ -1005,6 +1735,36 @@ def _(df_full, mo):
     return
 
 
+@app.cell
+def _(mo, tracer):
+    refresh_trace = mo.ui.button(label="Refresh") if tracer is not None else None
+    return (refresh_trace,)
+
+
+@app.cell
+def _(mo, refresh_trace, tracer):
+    # clicking refresh re-runs this cell with the timings recorded so far
+    refresh_trace
+    mo.center(
+        mo.accordion(
+            {
+                "Cell timings": mo.vstack([
+                    refresh_trace,
+                    mo.md(
+                        f"OMDb calls: **{tracer.counters['omdb_calls']}** "
+                        f"({tracer.counters['omdb_errors']} errors, "
+                        f"{tracer.counters['omdb_seconds']:.1f}s), "
+                        f"cache hits: **{tracer.counters['cache_hits']}**, "
+                        f"misses: **{tracer.counters['cache_misses']}**"
+                    ),
+                    tracer.summary(),
+                ])
+            }
+        )
+    ) if tracer is not None else None
+    return
+
+
 @app.cell
 def _():
     # df_full.select("Name", "BoxOffice", "Rating", "RatingPerEarning").drop_nulls()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Time of the insight aggregates: one group-by per cell vs the shared `WrappedStats`.
+
+`legacy` repeats each group-by the way the cells used to (director counts
+three times, monthly hours three times, ...); `stats` reads the same values
+from the memoized `wrapped_stats` cell of `apps/wrapped.py`:
+
+    python benchmarks/bench_aggregates.py --rows 1000000
+"""
+
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import polars as pl  # noqa: E402
+
+from apps.wrapped import full_dataframe, wrapped_stats  # noqa: E402
+from benchmarks.bench_metadata_join import DictCache  # noqa: E402
+from benchmarks.synthetic import synthetic_diary, synthetic_payloads  # noqa: E402
+
+
+def legacy_aggregates(df_full: pl.DataFrame) -> None:
+    def directors():
+        return (
+            df_full.group_by("Director")
+            .agg(pl.col("Name").count().alias("count"))
+            .sort("count", descending=True)
+        )
+
+    def months():
+        return df_full.group_by_dynamic("Watched Date", every="1mo").agg(
+            pl.col("Runtime_normalized").sum() / 60
+        )
+
+    df_full.select("Name").count().item()
+    df_full.select("Director").n_unique()
+    directors().select("Director").head(1).item()
+    directors().head(13)
+    directors()
+    int(df_full.select("Runtime_normalized").sum().item() / 60)
+    months().with_columns(
+        pl.col("Watched Date").dt.strftime("%B").alias("Month"),
+        pl.col("Runtime_normalized").cast(pl.Int32).alias("Hours"),
+    )
+    months().sort("Runtime_normalized", descending=True).select("Watched Date").head(1).item()
+    months().sort("Runtime_normalized", descending=True).with_columns(
+        pl.col("Watched Date").dt.strftime("%B").alias("Month"),
+        pl.col("Runtime_normalized").cast(pl.Int32).alias("Hours"),
+    )
+    df_full.group_by("Rated").agg(pl.col("Name").count().alias("count")).sort(
+        "count", descending=True
+    ).head(1).to_dict()
+
+
+def stats_aggregates(WrappedStats, df_full: pl.DataFrame) -> None:
+    stats = WrappedStats(df_full)
+    stats.total_movies
+    stats.unique_directors
+    stats.director_counts["Director"][0]
+    stats.director_counts.head(13)
+    stats.director_counts
+    stats.total_runtime
+    stats.month_hours.select("Month", "Hours")
+    stats.busiest_months["Watched Date"][0]
+    stats.busiest_months.select("Month", "Hours")
+    stats.rated_counts.head(1).to_dict()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--movies", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with open(ROOT / "movie_cache.json") as f:
+        template = next(iter(json.load(f).values()))
+    movie_cache = DictCache(synthetic_payloads(args.movies, template))
+    df_fmt = synthetic_diary(args.rows, args.movies).with_columns(
+        pl.col("Date", "Watched Date").str.to_date(),
+        pl.concat_str([pl.col("Name"), pl.col("Year")], separator="_").alias("title_year"),
+    )
+    _, defs = full_dataframe.run(df_fmt=df_fmt, movie_cache=movie_cache, pl=pl)
+    df_full = defs["df_full"].sort("Watched Date")
+    WrappedStats = wrapped_stats.run()[1]["WrappedStats"]
+
+    print(f"{args.rows} diary rows, best of {args.repeat}")
+    for name, run in [
+        ("legacy", lambda: legacy_aggregates(df_full)),
+        ("stats", lambda: stats_aggregates(WrappedStats, df_full)),
+    ]:
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            run()
+            best = min(best, time.perf_counter() - start)
+        print(f"{name:>8} {best * 1000:>9.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
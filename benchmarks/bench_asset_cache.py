@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""Hit ratio and bytes saved by `AssetCache` over repeated sessions.
+
+A local HTTP stand-in for raw.githubusercontent.com serves the diary, the
+compact metadata cache and its Parquet snapshot with `ETag` and/or
+`Last-Modified` validators and answers conditional requests with 304s.
+Every session fetches each asset through a fresh `AssetCache` over the same
+directory, like a new app session. The diary changes halfway, and a last
+session runs with the server down. Every body served is checked against the
+stand-in's current content:
+
+    python benchmarks/bench_asset_cache.py --sessions 20
+"""
+
+import io
+import os
+import sys
+import time
+import hashlib
+import argparse
+import tempfile
+import threading
+import contextlib
+from pathlib import Path
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from apps.wrapped import asset_cache  # noqa: E402
+
+ASSETS = {
+    "/extracted_files/diary.csv": ROOT / "extracted_files" / "diary.csv",
+    "/movie_cache.json.gz": ROOT / "movie_cache.json.gz",
+    "/movie_cache.parquet": ROOT / "movie_cache.parquet",
+}
+VALIDATORS = ["etag", "last-modified", "both"]
+
+
+class AssetServer(ThreadingHTTPServer):
+    def __init__(self, validators: str):
+        super().__init__(("127.0.0.1", 0), AssetHandler)
+        self.validators = validators
+        self.assets = {}
+        self.bytes_sent = 0
+        self.not_modified = 0
+        for path, source in ASSETS.items():
+            self.publish(path, source.read_bytes(), modified=time.time() - 3600)
+
+    def publish(self, path: str, content: bytes, modified: float) -> None:
+        etag = f'"{hashlib.sha256(content).hexdigest()[:16]}"'
+        self.assets[path] = (content, etag, int(modified))
+
+
+class AssetHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path not in self.server.assets:
+            self.send_error(404)
+            return
+        content, etag, modified = self.server.assets[self.path]
+        use_etag = self.server.validators in ("etag", "both")
+        use_date = self.server.validators in ("last-modified", "both")
+
+        # If-None-Match wins over If-Modified-Since, as in RFC 9110
+        if use_etag and "If-None-Match" in self.headers:
+            unchanged = self.headers["If-None-Match"] == etag
+        elif use_date and "If-Modified-Since" in self.headers:
+            since = parsedate_to_datetime(self.headers["If-Modified-Since"]).timestamp()
+            unchanged = modified <= since
+        else:
+            unchanged = False
+
+        self.send_response(304 if unchanged else 200)
+        if use_etag:
+            self.send_header("ETag", etag)
+        if use_date:
+            self.send_header("Last-Modified", formatdate(modified, usegmt=True))
+        if unchanged:
+            self.server.not_modified += 1
+            self.end_headers()
+            return
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+        self.server.bytes_sent += len(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def run_validators(AssetCache, validators: str, sessions: int) -> dict:
+    server = AssetServer(validators)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+
+    with tempfile.TemporaryDirectory() as root:
+        totals = AssetCache(root).stats()
+        for session in range(sessions + 1):
+            if session == sessions // 2:
+                # a new diary export, published a minute after the previous one
+                content, _, modified = server.assets["/extracted_files/diary.csv"]
+                server.publish(
+                    "/extracted_files/diary.csv", content + b"\n", modified=modified + 60
+                )
+            if session == sessions:
+                server.shutdown()
+                server.server_close()
+
+            cache = AssetCache(root, timeout=2)
+            for path, (content, _, _) in server.assets.items():
+                assert cache.get(base + path) == content, (validators, session, path)
+            for key, value in cache.stats().items():
+                totals[key] += value
+
+    served = totals["downloads"] + totals["revalidated"] + totals["stale"]
+    totals["hit_ratio"] = (totals["revalidated"] + totals["stale"]) / served
+    totals["bytes_sent"] = server.bytes_sent
+    totals["not_modified"] = server.not_modified
+    return totals
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=10, help="Sessions with the server up")
+    args = parser.parse_args()
+
+    AssetCache = asset_cache.run()[1]["AssetCache"]
+    size = sum(os.path.getsize(source) for source in ASSETS.values())
+    print(
+        f"{len(ASSETS)} assets ({size:,} bytes), {args.sessions} sessions online "
+        f"and 1 offline, the diary changes halfway"
+    )
+    print(
+        f"{'validators':>14} {'downloads':>10} {'304s':>6} {'stale':>6} {'hit ratio':>10} "
+        f"{'downloaded':>12} {'saved':>12}"
+    )
+    for validators in VALIDATORS:
+        # the offline session reports every stale copy it serves
+        with contextlib.redirect_stdout(io.StringIO()):
+            r = run_validators(AssetCache, validators, args.sessions)
+        assert r["revalidated"] == r["not_modified"]
+        assert r["bytes_downloaded"] == r["bytes_sent"]
+        print(
+            f"{validators:>14} {r['downloads']:>10} {r['revalidated']:>6} {r['stale']:>6} "
+            f"{r['hit_ratio']:>9.0%} {r['bytes_downloaded']:>12,} {r['bytes_saved']:>12,}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Throughput of `scripts/batch_wrapped.py` in users per second by worker count.
+
+Writes synthetic export zips sharing one pool of movies, fills a SQLite
+cache with their payloads so no request is made, then wraps every export
+with each worker count:
+
+    python benchmarks/bench_batch.py --users 200 --rows 2000 --workers 1 2 4 8
+"""
+
+import os
+import sys
+import json
+import argparse
+import tempfile
+import zipfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from apps.wrapped import metadata_store  # noqa: E402
+from benchmarks.synthetic import synthetic_diary, synthetic_payloads  # noqa: E402
+from scripts.batch_wrapped import run_batch  # noqa: E402
+
+
+def write_exports(directory: str, users: int, rows: int, movies: int) -> list:
+    diary = synthetic_diary(rows * users, movies, years=3)
+    paths = []
+    for user in range(users):
+        path = os.path.join(directory, f"user{user:05d}.zip")
+        with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("diary.csv", diary.slice(user * rows, rows).write_csv())
+        paths.append(path)
+    return paths
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=2000, help="Diary entries per user")
+    parser.add_argument("--movies", type=int, default=20_000, help="Distinct movies overall")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    with open(ROOT / "movie_cache.json") as f:
+        template = next(iter(json.load(f).values()))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "movie_cache.db")
+        _, store = metadata_store.run()
+        cache = store["SqliteMovieCache"](db_path)
+        for key, payload in synthetic_payloads(args.movies, template).items():
+            cache.put(key, payload)
+        cache.flush()
+        cache.conn.close()
+
+        exports = os.path.join(tmp, "exports")
+        os.makedirs(exports)
+        zip_paths = write_exports(exports, args.users, args.rows, args.movies)
+
+        print(f"{args.users} users x {args.rows} entries on {os.cpu_count()} cores")
+        print(f"{'workers':>8} {'time':>9} {'users/s':>9} {'scaling':>8}")
+        baseline = None
+        for workers in args.workers:
+            result = run_batch(zip_paths, os.path.join(tmp, f"out{workers}"), db_path, workers)
+            assert result["done"] == args.users, result["failed"]
+            baseline = baseline or result["users_per_second"]
+            print(
+                f"{workers:>8} {result['seconds']:>8.2f}s {result['users_per_second']:>9.1f} "
+                f"{result['users_per_second'] / baseline:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
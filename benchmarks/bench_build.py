@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Rebuild time of `scripts/build.py` for a repository with many notebooks.
+
+Copies `apps/your_wrapped.py` into a scratch repository `--notebooks`
+times, then times a cold sequential build, a cold parallel build, a
+no-op rebuild and a rebuild after editing one notebook:
+
+    python benchmarks/bench_build.py --notebooks 24 --jobs 8
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+BUILD = ROOT / "scripts" / "build.py"
+
+
+def build(repo: str, *flags: str) -> float:
+    # the scratch repository uses the marimo installed next to this interpreter
+    env = {**os.environ, "PATH": f"{Path(sys.executable).parent}{os.pathsep}{os.environ['PATH']}"}
+    start = time.perf_counter()
+    out = subprocess.run(
+        [sys.executable, str(BUILD), "--output-dir", "public", *flags],
+        cwd=repo, env=env, capture_output=True, text=True, check=True,
+    )
+    assert "Error exporting" not in out.stdout, out.stdout
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--notebooks", type=int, default=24)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as repo:
+        notebooks = Path(repo) / "notebooks"
+        notebooks.mkdir()
+        for i in range(args.notebooks):
+            shutil.copy(ROOT / "apps" / "your_wrapped.py", notebooks / f"notebook_{i:03d}.py")
+
+        print(f"{args.notebooks} notebooks, {args.jobs} jobs on {os.cpu_count()} cores")
+        results = {
+            "cold, sequential": build(repo, "--jobs", "1", "--force"),
+            f"cold, {args.jobs} jobs": build(repo, "--jobs", str(args.jobs), "--force"),
+            "unchanged": build(repo, "--jobs", str(args.jobs)),
+        }
+        with open(notebooks / "notebook_000.py", "a") as f:
+            f.write("\n# edited\n")
+        results["one notebook edited"] = build(repo, "--jobs", str(args.jobs))
+
+        for name, seconds in results.items():
+            print(f"{name:>22} {seconds:>8.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Startup time and lookup latency of the JSON and SQLite metadata caches.
+
+Writes a synthetic cache of `--movies` films in both formats, then times
+opening each backend and looking up random keys through the classes used by
+`apps/wrapped.py`:
+
+    python benchmarks/bench_cache_backends.py --movies 100000
+"""
+
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from apps.wrapped import metadata_store  # noqa: E402
+from benchmarks.synthetic import synthetic_payloads  # noqa: E402
+
+
+def bench(store, keys) -> tuple:
+    start = time.perf_counter()
+    store.get(keys[0])
+    startup = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for key in keys:
+        assert store.get(key) is not None
+    lookup = (time.perf_counter() - start) / len(keys)
+    return startup, lookup
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--movies", type=int, default=100_000)
+    parser.add_argument("--lookups", type=int, default=10_000)
+    args = parser.parse_args()
+
+    with open(ROOT / "movie_cache.json") as f:
+        template = next(iter(json.load(f).values()))
+    payloads = synthetic_payloads(args.movies, template)
+    keys = random.Random(0).choices(list(payloads), k=args.lookups)
+
+    _, defs = metadata_store.run()
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path, db_path = f"{tmp}/movie_cache.json", f"{tmp}/movie_cache.db"
+        with open(json_path, "w") as f:
+            json.dump(payloads, f, indent=4)
+        defs["SqliteMovieCache"](db_path).import_json(json_path)
+
+        results = {
+            "json": bench(defs["MovieCache"](json_path, writable=True), keys),
+            "sqlite": bench(defs["SqliteMovieCache"](db_path), keys),
+        }
+
+    print(f"{args.movies} cached movies, {args.lookups} lookups")
+    print(f"{'backend':>8} {'startup':>10} {'lookup':>10}")
+    for backend, (startup, lookup) in results.items():
+        print(f"{backend:>8} {startup * 1e3:>8.1f}ms {lookup * 1e6:>8.1f}us")
+
+
+if __name__ == "__main__":
+    main()
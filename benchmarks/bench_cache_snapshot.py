@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Bytes, load time and resident memory: movie_cache.json vs its exports.
+
+The `json` path is what the hosted app used to do (parse every payload into
+dicts) and `json.gz` the same for the compact gzip export, both through
+`MovieCache`; the Parquet path is `SnapshotMovieCache.frame` for the diary's movies. Each format
+is measured in a fresh interpreter; the download time is the file size over
+`--bandwidth`:
+
+    python benchmarks/bench_cache_snapshot.py              # shipped cache
+    python benchmarks/bench_cache_snapshot.py --movies 100000 --bandwidth 20
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.measure import peak_rss_mib  # noqa: E402
+
+
+def run_format(fmt: str, directory: str) -> dict:
+    from apps.wrapped import metadata_store
+
+    _, defs = metadata_store.run()
+    with open(os.path.join(directory, "keys.json")) as f:
+        keys = json.load(f)
+
+    rss_before = peak_rss_mib()
+    start = time.perf_counter()
+    if fmt in ("json", "json.gz"):
+        path = os.path.join(directory, f"movie_cache.{fmt}")
+        frame = defs["MovieCache"](path, writable=True).frame(keys)
+        size = os.path.getsize(path)
+    else:
+        snapshot_path = os.path.join(directory, "movie_cache.parquet")
+        frame = defs["SnapshotMovieCache"](snapshot_path, remote=False).frame(keys)
+        size = os.path.getsize(snapshot_path)
+    elapsed = time.perf_counter() - start
+    rss_after = peak_rss_mib()
+
+    assert frame.height == len(keys)
+    return {"bytes": size, "seconds": elapsed, "rss_mib": rss_after - rss_before}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--movies", type=int, default=0, help="Synthetic cache size (default: shipped cache)"
+    )
+    parser.add_argument(
+        "--bandwidth", type=float, default=10.0, help="Download speed in Mbit/s"
+    )
+    parser.add_argument("--format", choices=["json", "json.gz", "parquet"], help=argparse.SUPPRESS)
+    parser.add_argument("--dir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.format:
+        print(json.dumps(run_format(args.format, args.dir)))
+        return
+
+    from benchmarks.synthetic import synthetic_payloads
+    from scripts.build_cache_snapshot import build_export, build_snapshot
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(ROOT / "movie_cache.json") as f:
+            cache = json.load(f)
+        if args.movies:
+            cache = synthetic_payloads(args.movies, next(iter(cache.values())))
+        with open(os.path.join(tmp, "movie_cache.json"), "w") as f:
+            json.dump(cache, f, indent=4)
+        with open(os.path.join(tmp, "keys.json"), "w") as f:
+            json.dump(list(cache)[::10], f)
+        build_snapshot(os.path.join(tmp, "movie_cache.json"), os.path.join(tmp, "movie_cache.parquet"))
+        build_export(os.path.join(tmp, "movie_cache.json"), os.path.join(tmp, "movie_cache.json.gz"))
+
+        print(f"{len(cache)} cached movies, loading every 10th, {args.bandwidth:g} Mbit/s")
+        print(f"{'format':>8} {'bytes':>12} {'download':>9} {'load':>9} {'RSS':>9}")
+        for fmt in ["json", "json.gz", "parquet"]:
+            out = subprocess.run(
+                [sys.executable, __file__, "--format", fmt, "--dir", tmp],
+                capture_output=True, text=True, check=True,
+            )
+            r = json.loads(out.stdout.splitlines()[-1])
+            download = r["bytes"] * 8 / (args.bandwidth * 1e6)
+            print(
+                f"{fmt:>8} {r['bytes']:>12,} {download * 1e3:>7.0f}ms "
+                f"{r['seconds'] * 1e3:>7.1f}ms {r['rss_mib']:>6.1f}MiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
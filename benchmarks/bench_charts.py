@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Build time, payload and render time of the hours chart on long series.
+
+`svg` is the previous path (every point as a Python list, SVG traces);
+`webgl` plots every point with WebGL traces; `binned` is
+`hours_per_month_figure` from `apps/wrapped.py`, which bins the series in
+Polars and switches to WebGL above its threshold. `cached` rebuilds the
+binned chart through `cached_figure` once its JSON is cached. Browser render
+time needs the optional `playwright` package:
+
+    python benchmarks/bench_charts.py --sizes 1000 100000 1000000
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import polars as pl  # noqa: E402
+import plotly.express as px  # noqa: E402
+import plotly.io as pio  # noqa: E402
+
+from apps.wrapped import figures  # noqa: E402
+from scripts.static_report import PLOTLY_CDN, first_render  # noqa: E402
+
+PAGE = """<!DOCTYPE html>
+<html><head><script src="{plotly}"></script></head>
+<body><div id="chart"></div><script>
+const figure = {figure};
+Plotly.newPlot("chart", figure.data, figure.layout).then(() => {{
+  document.body.dataset.rendered = performance.now();
+}});
+</script></body></html>
+"""
+
+
+def hours_series(points: int) -> pl.DataFrame:
+    """Hours watched per day, one point per day over `points` days."""
+    return pl.DataFrame({"Month": pl.date_range(
+        pl.date(1900, 1, 1), pl.date(1900, 1, 1) + pl.duration(days=points - 1), eager=True
+    )}).with_columns(
+        ((pl.int_range(points).hash(0) % 600) / 100).alias("Hours")
+    )
+
+
+def render_seconds(figure_json: str, tmp: str) -> float:
+    """Seconds until Plotly has drawn the figure in headless Chromium, or None."""
+    path = os.path.join(tmp, "chart.html")
+    with open(path, "w") as f:
+        f.write(PAGE.format(plotly=PLOTLY_CDN, figure=figure_json))
+    measured = first_render(Path(path).as_uri(), "body[data-rendered]")
+    return measured[0] if measured else None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    defs = figures.run()[1]
+    variants = {
+        "svg": lambda df: px.line(
+            x=df["Month"].to_list(), y=df["Hours"].to_list(), markers=True, render_mode="svg"
+        ),
+        "webgl": lambda df: defs["hours_per_month_figure"](df, max_points=None),
+        "binned": defs["hours_per_month_figure"],
+        "cached": lambda df: defs["cached_figure"](defs["hours_per_month_figure"], df),
+    }
+    # the first figure pays for importing plotly's templates
+    variants["binned"](hours_series(10))
+
+    print(f"{'points':>9} {'variant':>8} {'build':>9} {'to_json':>9} {'payload':>10} {'render':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for points in args.sizes:
+            df = hours_series(points)
+            defs["cached_figure"](defs["hours_per_month_figure"], df)
+            for name, build in variants.items():
+                start = time.perf_counter()
+                fig = build(df)
+                built = time.perf_counter() - start
+                start = time.perf_counter()
+                figure_json = pio.to_json(fig, validate=False)
+                serialized = time.perf_counter() - start
+                rendered = render_seconds(figure_json, tmp)
+                shown_render = f"{rendered:>7.2f}s" if rendered is not None else f"{'-':>8}"
+                print(
+                    f"{points:>9} {name:>8} {built * 1000:>7.0f}ms {serialized * 1000:>7.0f}ms "
+                    f"{len(figure_json) / 2**10:>7.0f}KiB {shown_render}"
+                )
+    if rendered is None:
+        print("install playwright (and `playwright install chromium`) to time the render")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Cost of re-uploading a slightly longer export: full vs delta enrichment.
+
+`full` enriches every movie of the new export again; `delta` is
+`enrich_delta` from `apps/your_wrapped.py`, which reuses the entries
+enriched by the previous upload and only fetches the new ones. Both run
+against the local OMDb stub:
+
+    python benchmarks/bench_delta_enrichment.py --rows 5000 --new 50
+"""
+
+import io
+import os
+import sys
+import time
+import argparse
+import tempfile
+import contextlib
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import polars as pl  # noqa: E402
+
+from apps.your_wrapped import (  # noqa: E402
+    delta_enrichment,
+    metadata_fields,
+    omdb_client,
+    omdb_enrichment,
+)
+from benchmarks.synthetic import synthetic_diary  # noqa: E402
+from scripts.omdb_stub import load_payloads, make_server, serve_in_background  # noqa: E402
+
+
+def export(rows: int, movies: int) -> pl.DataFrame:
+    return synthetic_diary(rows, movies).with_columns(
+        pl.concat_str([pl.col("Name"), pl.col("Year")], separator="_").alias("title_year")
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5_000)
+    parser.add_argument("--new", type=int, default=50, help="Entries added since the last upload")
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument(
+        "--latency", type=float, default=0.01, help="Stub delay per request in seconds"
+    )
+    args = parser.parse_args()
+
+    server = make_server(load_payloads(ROOT / "movie_cache.json"), latency=args.latency)
+    url = serve_in_background(server)
+
+    calls = []
+    _, client = omdb_client.run(OMDB_API_URL=url)
+
+    def get_movie_data(title, year, api_key):
+        calls.append(title)
+        return client["get_movie_data"](title, year, api_key)
+
+    _, enrichment = omdb_enrichment.run(get_movie_data=get_movie_data, OMDB_WORKERS=args.workers)
+    get_metatadata = enrichment["get_metatadata"]
+    _, fields = metadata_fields.run()
+    _, delta = delta_enrichment.run(
+        get_metatadata=get_metatadata, metadata_frame=fields["metadata_frame"]
+    )
+    enrich_delta = delta["enrich_delta"]
+
+    # every entry is its own movie, so new entries are new movies to fetch
+    total = args.rows + args.new
+    last_week, today = export(args.rows, total), export(total, total)
+
+    print(f"{args.rows} entries uploaded before, {args.new} new ones")
+    print(f"{'mode':>6} {'requests':>9} {'time':>9}")
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        state = os.path.join(tmp, "enrichment_state.parquet")
+        enrich_delta(last_week, "bench", state_path=state)
+
+        results = {}
+        calls.clear()
+        start = time.perf_counter()
+        full = fields["metadata_frame"](get_metatadata(today, "bench"))
+        results["full"] = (len(calls), time.perf_counter() - start)
+
+        calls.clear()
+        start = time.perf_counter()
+        metadata = enrich_delta(today, "bench", state_path=state)
+        results["delta"] = (len(calls), time.perf_counter() - start)
+
+    assert metadata.sort("title_year").equals(full.sort("title_year"))
+    for mode, (requests, seconds) in results.items():
+        print(f"{mode:>6} {requests:>9} {seconds:>8.2f}s")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Wall-clock speedup of the concurrent OMDb enrichment in `apps/your_wrapped.py`.
+
+Runs `get_metatadata` sequentially and with a thread pool against the local
+OMDb stub, so no API quota is used. The stub can add jitter, rate limiting
+and "Movie not found!" errors to load-test the enrichment; the movies that
+came back without metadata are reported:
+
+    python benchmarks/bench_enrichment.py --sizes 100 1000 10000
+    python benchmarks/bench_enrichment.py --jitter 0.05 --rate-limit 200 --not-found-rate 0.05
+"""
+
+import io
+import sys
+import time
+import argparse
+import contextlib
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from apps.your_wrapped import omdb_client, omdb_enrichment  # noqa: E402
+from benchmarks.synthetic import synthetic_diary  # noqa: E402
+from scripts.omdb_stub import load_payloads, make_server, serve_in_background  # noqa: E402
+
+
+def time_enrichment(get_metatadata, diary, workers: int) -> tuple:
+    """Seconds taken and movies left without metadata."""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        metadata = get_metatadata(diary, "bench", max_workers=workers)
+    elapsed = time.perf_counter() - start
+    assert len(metadata) == diary.height
+    return elapsed, sum(payload is None for payload in metadata.values())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument(
+        "--latency", type=float, default=0.01, help="Stub delay per request in seconds"
+    )
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=int, default=0, help="Stub requests per second")
+    parser.add_argument("--not-found-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = make_server(
+        load_payloads(ROOT / "movie_cache.json"),
+        latency=args.latency,
+        jitter=args.jitter,
+        rate_limit=args.rate_limit,
+        not_found_rate=args.not_found_rate,
+        seed=0,
+    )
+    url = serve_in_background(server)
+
+    _, client = omdb_client.run(OMDB_API_URL=url)
+    _, enrichment = omdb_enrichment.run(get_movie_data=client["get_movie_data"])
+    get_metatadata = enrichment["get_metatadata"]
+
+    print(
+        f"{'titles':>8} {'sequential':>12} {f'{args.workers} workers':>12} {'speedup':>8} "
+        f"{'missing':>15}"
+    )
+    for size in args.sizes:
+        diary = synthetic_diary(size)
+        sequential, missing_sequential = time_enrichment(get_metatadata, diary, 1)
+        concurrent, missing_concurrent = time_enrichment(get_metatadata, diary, args.workers)
+        print(
+            f"{size:>8} {sequential:>11.2f}s {concurrent:>11.2f}s "
+            f"{sequential / concurrent:>7.1f}x {missing_sequential:>7}/{missing_concurrent:<7}"
+        )
+
+    server.shutdown()
+    print("stub answers: " + ", ".join(f"{k} {v}" for k, v in sorted(server.counts.items())))
+
+
+if __name__ == "__main__":
+    main()
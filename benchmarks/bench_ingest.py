@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Diary ingestion: eager read + string filter vs the lazy `load_diary` scan.
+
+`legacy` is the previous ingestion (read every row, compare `Watched Date`
+strings, parse dates afterwards); `scan` is `load_diary` from the apps, whose
+dates `df_fmt` keeps as they are. Diaries span `--years` years so the filter
+keeps roughly one row in `--years`. Each variant runs in a fresh interpreter
+so its peak RSS is reported separately:
+
+    python benchmarks/bench_ingest.py --sizes 10000 100000 1000000
+"""
+
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import polars as pl  # noqa: E402
+
+from apps.wrapped import diary_loader  # noqa: E402
+from benchmarks.measure import peak_rss_mib  # noqa: E402
+from benchmarks.synthetic import synthetic_diary  # noqa: E402
+
+
+def legacy_ingest(path: str, year: int) -> pl.DataFrame:
+    return (
+        pl.read_csv(path)
+        .filter(
+            (pl.col("Watched Date") > pl.lit(f"{year}-01-01"))
+            & (pl.col("Watched Date") < pl.lit(f"{year + 1}-01-01"))
+        )
+        .with_columns(
+            pl.col("Date").str.to_datetime("%Y-%m-%d"),
+            pl.col("Watched Date").str.to_datetime("%Y-%m-%d"),
+        )
+    )
+
+
+def run_variant(variant: str, path: str, year: int, repeat: int) -> dict:
+    _, defs = diary_loader.run()
+    load_diary = defs["load_diary"]
+
+    def scan_ingest(path: str, year: int) -> pl.DataFrame:
+        return load_diary(path, year).collect()
+
+    ingest = legacy_ingest if variant == "legacy" else scan_ingest
+    rss_before = peak_rss_mib()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        kept = ingest(path, year).height
+        timings.append(time.perf_counter() - start)
+    return {"seconds": min(timings), "peak_mib": peak_rss_mib() - rss_before, "kept": kept}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--year", type=int, default=2024)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--variant", choices=["legacy", "scan"], help=argparse.SUPPRESS)
+    parser.add_argument("--path", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variant:
+        print(json.dumps(run_variant(args.variant, args.path, args.year, args.repeat)))
+        return
+
+    print(f"{'rows':>9} {'kept':>8} {'variant':>8} {'time':>9} {'peak RSS':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            path = f"{tmp}/diary_{size}.csv"
+            synthetic_diary(size, year=args.year, years=args.years).write_csv(path)
+
+            for variant in ["legacy", "scan"]:
+                out = subprocess.run(
+                    [sys.executable, __file__, "--variant", variant, "--path", path,
+                     "--year", str(args.year), "--repeat", str(args.repeat)],
+                    capture_output=True, text=True, check=True,
+                )
+                r = json.loads(out.stdout.splitlines()[-1])
+                print(
+                    f"{size:>9} {r['kept']:>8} {variant:>8} "
+                    f"{r['seconds']:>8.3f}s {r['peak_mib']:>7.1f}MiB"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Bytes per row of `df_full` with String/Datetime columns vs Categorical/Date.
+
+Runs the `diary_format` and `full_dataframe` cells of `apps/wrapped.py` on a
+realistic synthetic diary. `before` is the same frame cast back to the
+previous dtypes (String names, List(String) lists, Datetime dates), so both
+sides hold the same values.
+
+Polars' `estimated_size` only adds up string bytes, so string columns are
+sized from their layout instead: a 16-byte view per value plus the bytes of
+strings longer than the 12 a view holds inline. Categorical columns are 4
+bytes per value plus their string table:
+
+    python benchmarks/bench_memory.py --rows 1000000
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import polars as pl  # noqa: E402
+
+from apps.wrapped import diary_format, full_dataframe  # noqa: E402
+from benchmarks.bench_metadata_join import DictCache  # noqa: E402
+from benchmarks.synthetic import realistic_diary, realistic_payloads  # noqa: E402
+
+
+def string_bytes(values: pl.Series) -> int:
+    lengths = values.str.len_bytes()
+    return 16 * len(values) + int(lengths.filter(lengths > 12).sum())
+
+
+def column_bytes(column: pl.Series) -> int:
+    """Bytes `column` takes in memory, validity bitmaps aside."""
+    if column.dtype == pl.String:
+        return string_bytes(column)
+    if column.dtype == pl.Categorical:
+        return 4 * len(column) + string_bytes(column.cat.get_categories())
+    if isinstance(column.dtype, pl.List) and column.dtype.inner in (pl.String, pl.Categorical):
+        offsets = 8 * (len(column) + 1)
+        return offsets + column_bytes(column.drop_nulls().explode().drop_nulls())
+    return column.estimated_size()
+
+
+def previous_dtypes(df: pl.DataFrame) -> pl.DataFrame:
+    """`df` with the dtypes `df_full` had before the Categorical/Date change."""
+    return df.with_columns(
+        pl.col(pl.Categorical).cast(pl.String),
+        pl.col(pl.List(pl.Categorical)).cast(pl.List(pl.String)),
+        pl.col(pl.Date).cast(pl.Datetime),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument(
+        "--movies", type=int, help="Distinct movies (default: a fifth of the rows, at most 100k)"
+    )
+    parser.add_argument("--years", type=int, default=5)
+    args = parser.parse_args()
+
+    movies = args.movies or max(1, min(args.rows // 5, 100_000))
+    df = realistic_diary(args.rows, movies, years=args.years).with_columns(
+        pl.col("Date", "Watched Date").str.to_date()
+    )
+    df_fmt = diary_format.run(df=df, pl=pl)[1]["df_fmt"]
+    movie_cache = DictCache(realistic_payloads(movies))
+    after = full_dataframe.run(df_fmt=df_fmt, movie_cache=movie_cache, pl=pl)[1]["df_full"]
+    before = previous_dtypes(after)
+
+    print(f"{args.rows} diary rows, {movies} movies, bytes per row")
+    print(f"{'column':<16}{'before':>10}{'after':>10}{'ratio':>8}")
+    old_total = new_total = 0
+    for column in after.columns:
+        old, new = column_bytes(before[column]), column_bytes(after[column])
+        old_total += old
+        new_total += new
+        if after[column].dtype != before[column].dtype:
+            print(f"{column:<16}{old / args.rows:>10.1f}{new / args.rows:>10.1f}{old / new:>7.1f}x")
+    old, new = old_total / args.rows, new_total / args.rows
+    print(f"{'df_full':<16}{old:>10.1f}{new:>10.1f}{old / new:>7.1f}x")
+    print(f"{'':<16}{old * args.rows / 2**20:>7.0f}MiB{new * args.rows / 2**20:>7.0f}MiB")
+
+
+if __name__ == "__main__":
+    main()
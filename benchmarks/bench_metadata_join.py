@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Time and peak memory of building `df_full`: per-field `map_batches` vs one join.
+
+`legacy` is the previous implementation (one Python pass over the diary per
+OMDb field); `join` runs the `full_dataframe` cell of `apps/wrapped.py`. Each
+variant runs in a fresh interpreter so peak RSS is not shared:
+
+    python benchmarks/bench_metadata_join.py --rows 100000
+"""
+
+import sys
+import json
+import time
+import argparse
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import polars as pl  # noqa: E402
+
+from apps.wrapped import full_dataframe, metadata_store  # noqa: E402
+from benchmarks.measure import peak_rss_mib  # noqa: E402
+from benchmarks.synthetic import synthetic_diary, synthetic_payloads  # noqa: E402
+
+LIST_FIELDS = ["Genre", "Writer", "Actors", "Country", "Language"]
+FIELDS = [
+    "Genre", "Runtime", "Director", "Writer", "Actors", "Country",
+    "Language", "Metascore", "imdbRating", "Rated", "BoxOffice", "Poster",
+]
+
+
+def legacy_df_full(df_fmt: pl.DataFrame, cache: dict) -> pl.DataFrame:
+    def extract_metadata(title_year, param):
+        values = []
+        for ty in title_year:
+            data = cache.get(ty)
+            values.append(data[param] if data is not None else None)
+        return pl.Series("metadata", values)
+
+    columns = []
+    for field in FIELDS:
+        col = pl.struct(["title_year"]).map_batches(
+            lambda movie, field=field: extract_metadata(
+                movie.struct.field("title_year"), field
+            )
+        )
+        if field in LIST_FIELDS:
+            col = col.str.split(", ")
+        elif field == "Metascore":
+            col = col.str.to_integer(strict=False)
+        elif field == "imdbRating":
+            col = col.str.to_decimal().cast(pl.Float64)
+        columns.append(col.alias(field))
+
+    return df_fmt.with_columns(columns).with_columns(
+        pl.col("Runtime").str.replace(" min", "").str.to_integer().alias("Runtime_normalized"),
+        (pl.col("Metascore") * 5 / 100).alias("Normalized_Metascore"),
+        (pl.col("imdbRating") * 5 / 10).alias("Normalized_IMDB"),
+        (pl.col("Rating") - pl.col("Metascore") * 5 / 100).abs().alias("Rating_Difference_Metascore"),
+        (pl.col("Rating") - pl.col("imdbRating") * 5 / 10).abs().alias("Rating_Difference_IMDB"),
+        pl.col("BoxOffice").str.replace_all(r"[\$,]", "").str.to_integer(strict=False),
+    ).with_columns(
+        (pl.col("Rating") / pl.col("BoxOffice")).alias("RatingPerEarning"),
+    )
+
+
+class DictCache:
+    def __init__(self, entries: dict):
+        _, defs = metadata_store.run()
+        self.entries = defs["normalize_cache"](entries)
+        self.metadata_frame = defs["metadata_frame"]
+
+    def frame(self, keys):
+        return self.metadata_frame({k: self.entries[k] for k in keys if k in self.entries})
+
+
+def run_variant(variant: str, rows: int, movies: int) -> dict:
+    with open(ROOT / "movie_cache.json") as f:
+        template = next(iter(json.load(f).values()))
+    cache = synthetic_payloads(movies, template)
+    df_fmt = synthetic_diary(rows, movies).with_columns(
+        pl.concat_str([pl.col("Name"), pl.col("Year")], separator="_").alias("title_year")
+    )
+
+    movie_cache = DictCache(cache)
+    rss_before = peak_rss_mib()
+    start = time.perf_counter()
+    if variant == "legacy":
+        df_full = legacy_df_full(df_fmt, cache)
+    else:
+        _, defs = full_dataframe.run(df_fmt=df_fmt, movie_cache=movie_cache, pl=pl)
+        df_full = defs["df_full"]
+    elapsed = time.perf_counter() - start
+    rss_after = peak_rss_mib()
+
+    return {
+        "seconds": elapsed,
+        "peak_mib": rss_after - rss_before,
+        "rows": df_full.height,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--movies", type=int, default=20_000)
+    parser.add_argument("--variant", choices=["legacy", "join"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variant:
+        print(json.dumps(run_variant(args.variant, args.rows, args.movies)))
+        return
+
+    print(f"{args.rows} diary rows, {args.movies} distinct movies")
+    print(f"{'variant':>8} {'time':>9} {'peak RSS':>10}")
+    for variant in ["legacy", "join"]:
+        out = subprocess.run(
+            [sys.executable, __file__, "--variant", variant,
+             "--rows", str(args.rows), "--movies", str(args.movies)],
+            capture_output=True, text=True, check=True,
+        )
+        result = json.loads(out.stdout.splitlines()[-1])
+        print(f"{variant:>8} {result['seconds']:>8.2f}s {result['peak_mib']:>7.1f}MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""OMDb lookups the offline `TitleIndex` avoids, and what it costs per lookup.
+
+Every movie of `movie_cache.json` is looked up under spellings a diary may
+use (case, accents, punctuation, `&`, a dropped article) and a release year
+one off; each resolved spelling is one OMDb request that is not sent. The
+same movies as sequels or far-off years must not resolve. Lookup time is
+measured with the index padded to `--movies` synthetic titles:
+
+    python benchmarks/bench_title_index.py --movies 100000
+"""
+
+import re
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from apps.wrapped import title_index  # noqa: E402
+from benchmarks.synthetic import realistic_payloads  # noqa: E402
+
+ACCENTS = str.maketrans("aeiou", "áéíóú")
+
+
+def spellings(title: str) -> list:
+    """Ways a diary could write `title` that miss the exact cache key."""
+    variants = {
+        title.lower(),
+        title.upper(),
+        re.sub(r"[^\w\s]", "", title),
+        re.sub(r"[^\w\s]", " ", title),
+        title.replace(" and ", " & ") if " and " in title else title.replace(" & ", " and "),
+        re.sub(r"^(The|A|An) ", "", title),
+        title.translate(ACCENTS),
+    }
+    variants.discard(title)
+    return sorted(variants)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--movies", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with open(ROOT / "movie_cache.json") as f:
+        cache = json.load(f)
+    TitleIndex = title_index.run()[1]["TitleIndex"]
+
+    index = TitleIndex(lambda: cache)
+    lookups = correct = 0
+    for key in cache:
+        title, _, year = key.rpartition("_")
+        for variant in spellings(title):
+            for shift in (0, 1):
+                lookups += 1
+                correct += index.lookup(variant, int(year) + shift) == key
+    avoided = index.resolved
+    print(
+        f"{lookups} misspelled lookups of {len(cache)} cached movies: "
+        f"{avoided} resolved offline ({avoided / lookups:.0%}), {correct} to the right movie"
+    )
+
+    wrong = []
+    for key in cache:
+        title, _, year = key.rpartition("_")
+        for other_title, other_year in [(f"{title} 2", year), (title, int(year) + 5)]:
+            match = index.lookup(other_title, other_year)
+            if match is not None and match != key.replace(title, other_title):
+                wrong.append((other_title, other_year, match))
+    print(f"{2 * len(cache)} sequels and remakes: {len(wrong)} wrongly resolved")
+    for other_title, other_year, match in wrong:
+        print(f"  {other_title} ({other_year}) -> {match}")
+
+    padded = {**realistic_payloads(args.movies), **cache}
+    index = TitleIndex(lambda: padded)
+    start = time.perf_counter()
+    index.lookup("warmup", 2000)
+    build = time.perf_counter() - start
+    queries = [(v, key.rpartition("_")[2]) for key in cache for v in spellings(key.rpartition("_")[0])]
+    start = time.perf_counter()
+    for title, year in queries:
+        index.lookup(title, year)
+    per_lookup = (time.perf_counter() - start) / len(queries)
+    print(
+        f"index of {len(padded)} movies built in {build:.2f}s, "
+        f"{per_lookup * 1e6:.0f}us per lookup"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Time of the top genres/actors/writers/countries/languages: `Counter` vs `top_from_lists`.
+
+`legacy` is the previous `get_top_from_list`, called once per column;
+`vectorized` is `top_from_lists` from `apps/wrapped.py`, which counts all
+columns in one `collect_all`. Both must return the same items in the same
+order, ties included:
+
+    python benchmarks/bench_top_k.py --sizes 100000 1000000
+"""
+
+import sys
+import time
+import argparse
+from collections import Counter
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import polars as pl  # noqa: E402
+
+from apps.wrapped import top_k  # noqa: E402
+
+COLUMNS = ["Genre", "Actors", "Writer", "Country", "Language"]
+VOCABULARY = {"Genre": 25, "Actors": 50_000, "Writer": 20_000, "Country": 60, "Language": 40}
+
+
+def get_top_from_list(df, column, top=5):
+    items = []
+    for item_list in df.select(column).rows():
+        if item_list[0]:
+            for i in item_list[0]:
+                items.append(i)
+
+    item_counts = Counter(items)
+
+    return item_counts.most_common(top)
+
+
+def synthetic_lists(n_rows: int) -> pl.DataFrame:
+    """List columns shaped like `df_full`: 1-4 items per row, some rows missing."""
+    i = pl.int_range(n_rows, eager=True)
+    columns = {}
+    for n, (column, size) in enumerate(VOCABULARY.items()):
+        items = [
+            pl.format(f"{column} {{}}", (i * (7 + 4 * n + j) + j * j) % size)
+            for j in range(4)
+        ]
+        lists = pl.concat_list(items).list.head(i % 4 + 1)
+        columns[column] = pl.when(i % 50 != 0).then(lists)
+    return pl.select(**columns)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("-k", type=int, default=10)
+    args = parser.parse_args()
+
+    top_from_lists = top_k.run()[1]["top_from_lists"]
+
+    print(f"{'rows':>9} {'legacy':>9} {'vectorized':>11} {'speedup':>8}")
+    for size in args.sizes:
+        df = synthetic_lists(size)
+
+        start = time.perf_counter()
+        legacy = {column: get_top_from_list(df, column, args.k) for column in COLUMNS}
+        legacy_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        vectorized = top_from_lists(df, COLUMNS, args.k)
+        vectorized_s = time.perf_counter() - start
+
+        assert vectorized == legacy, "top-k results differ from Counter.most_common"
+        print(
+            f"{size:>9} {legacy_s:>8.2f}s {vectorized_s:>10.2f}s "
+            f"{legacy_s / vectorized_s:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
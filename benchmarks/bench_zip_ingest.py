@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Peak memory of loading a large, many-year Letterboxd export zip.
+
+`legacy` is the previous upload path extended to all four CSVs (read each
+member out of the zip into memory, then parse it); `stream` is
+`process_zip_and_load_csv` from `apps/your_wrapped.py`, which parses
+members chunk by chunk while they inflate. Besides the peak, each run
+reports the memory still held by the loaded frames: the difference is the
+transient cost of loading. tests/test_zip_loader.py checks that the
+streaming transient stays within a few chunks and that zip bombs are
+rejected:
+
+    python benchmarks/bench_zip_ingest.py --rows 400000 --years 20
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+import zipfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import polars as pl  # noqa: E402
+
+from apps.your_wrapped import zip_loader  # noqa: E402
+from benchmarks.measure import peak_rss_mib, rss_mib  # noqa: E402
+from benchmarks.synthetic import synthetic_diary  # noqa: E402
+
+
+def write_export(path: str, rows: int, years: int) -> int:
+    """Write an export zip and return the uncompressed diary.csv size in bytes."""
+    diary = synthetic_diary(rows, years=years)
+    with tempfile.TemporaryDirectory() as tmp, zipfile.ZipFile(
+        path, "w", compression=zipfile.ZIP_DEFLATED
+    ) as zf:
+        files = {
+            "diary.csv": diary,
+            "ratings.csv": diary.select("Date", "Name", "Year", "Letterboxd URI", "Rating"),
+            "watched.csv": diary.select("Date", "Name", "Year", "Letterboxd URI"),
+            "reviews.csv": diary.head(rows // 10).with_columns(pl.lit("Loved it").alias("Review")),
+        }
+        for name, frame in files.items():
+            frame.write_csv(os.path.join(tmp, name))
+            zf.write(os.path.join(tmp, name), name)
+        return zf.getinfo("diary.csv").file_size
+
+
+def write_bomb(path: str, size: int) -> None:
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        with zf.open("diary.csv", "w") as member:
+            block = b"0" * (1024 * 1024)
+            for _ in range(size // len(block)):
+                member.write(block)
+
+
+def run_variant(variant: str, path: str) -> dict:
+    _, defs = zip_loader.run()
+    process_zip_and_load_csv = defs["process_zip_and_load_csv"]
+
+    rss_before = rss_mib()
+    peak_before = peak_rss_mib()
+    start = time.perf_counter()
+    if variant == "legacy":
+        frames = {}
+        with zipfile.ZipFile(path) as zf:
+            for name in ["diary.csv", "ratings.csv", "watched.csv", "reviews.csv"]:
+                with zf.open(name) as csv_file:
+                    frames[name] = pl.read_csv(csv_file.read())
+    else:
+        frames = process_zip_and_load_csv(path)
+    elapsed = time.perf_counter() - start
+    peak = peak_rss_mib() - peak_before
+    return {
+        "seconds": elapsed,
+        "peak_mib": peak,
+        "transient_mib": peak - (rss_mib() - rss_before),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=400_000)
+    parser.add_argument("--years", type=int, default=20)
+    parser.add_argument("--variant", choices=["legacy", "stream"], help=argparse.SUPPRESS)
+    parser.add_argument("--path", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variant:
+        print(json.dumps(run_variant(args.variant, args.path)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "export.zip")
+        diary_mib = write_export(path, args.rows, args.years) / 2**20
+        print(
+            f"{args.rows} diary rows over {args.years} years: "
+            f"{os.path.getsize(path) / 2**20:.1f} MiB zipped, {diary_mib:.1f} MiB diary.csv"
+        )
+
+        print(f"{'variant':>8} {'time':>9} {'peak RSS':>10} {'transient':>10}")
+        for variant in ["legacy", "stream"]:
+            out = subprocess.run(
+                [sys.executable, __file__, "--variant", variant, "--path", path],
+                capture_output=True, text=True, check=True,
+            )
+            r = json.loads(out.stdout.splitlines()[-1])
+            # the legacy frames reuse the freed buffers, so only the peak compares
+            transient = f"{r['transient_mib']:>7.1f}MiB" if variant == "stream" else "-"
+            print(f"{variant:>8} {r['seconds']:>8.2f}s {r['peak_mib']:>7.1f}MiB {transient:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Measurement helpers shared by the benchmarks."""
+
+import os
+import sys
+import resource
+import subprocess
+from typing import Optional
+
+
+def _status_mib(field: str) -> Optional[float]:
+    """A memory field of /proc/self/status in MiB, None off Linux."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(f"{field}:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def peak_rss_mib() -> float:
+    """Peak resident memory of this process in MiB.
+
+    Reads VmHWM on Linux, which unlike `ru_maxrss` is not inherited from the
+    parent across fork/exec, so subprocess measurements start from zero.
+    """
+    peak = _status_mib("VmHWM")
+    if peak is not None:
+        return peak
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+
+def rss_mib() -> float:
+    """Current resident memory of this process in MiB.
+
+    Reads VmRSS on Linux and asks `ps` elsewhere, which reports KiB.
+    """
+    rss = _status_mib("VmRSS")
+    if rss is not None:
+        return rss
+    out = subprocess.run(
+        ["ps", "-o", "rss=", "-p", str(os.getpid())], capture_output=True, text=True, check=True
+    )
+    return int(out.stdout) / 1024
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""Time every stage of the wrapped pipeline on realistic synthetic diaries.
+
+Each size runs the cells of `apps/wrapped.py` one stage at a time: CSV
+ingest, `df_fmt`, `df_full` enrichment, each `WrappedStats` aggregate (per
+year and through `by_year`), `top_from_lists` and the Plotly figure
+builders. Stages are timed best of `--repeat`. Results are saved as JSON
+under `--output`, so runs can be compared over time with `--compare`:
+
+    python benchmarks/suite.py --sizes 1000 100000 1000000
+    python benchmarks/suite.py --sizes 1000 100000 --compare benchmarks/results/<run>.json
+
+10M rows need roughly 8 GB of memory for `df_full`.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import subprocess
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import polars as pl  # noqa: E402
+
+from apps import wrapped  # noqa: E402
+from benchmarks.bench_metadata_join import DictCache  # noqa: E402
+from benchmarks.synthetic import realistic_diary, realistic_payloads  # noqa: E402
+from scripts.batch_wrapped import LIST_COLUMNS  # noqa: E402
+
+AGGREGATES = [
+    "total_movies", "unique_directors", "director_counts", "total_runtime",
+    "month_hours", "busiest_months", "rated_counts",
+]
+# aggregates built on another one are timed with that one already memoized
+DEPENDS_ON = {"busiest_months": ["month_hours"]}
+
+
+def best_of(repeat: int, run) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def time_aggregate(WrappedStats, df: pl.DataFrame, name: str, repeat: int) -> float:
+    def run():
+        getattr(stats, name)
+
+    best = float("inf")
+    for _ in range(repeat):
+        stats = WrappedStats(df)
+        for dependency in DEPENDS_ON.get(name, []):
+            getattr(stats, dependency)
+        best = min(best, best_of(1, run))
+    return best
+
+
+def run_size(rows: int, movies: int, years: int, repeat: int) -> dict:
+    """Seconds spent in each stage for a diary of `rows` entries."""
+    timings = {}
+    diary = realistic_diary(rows, movies, years=years)
+    movie_cache = DictCache(realistic_payloads(movies))
+
+    load_diary = wrapped.diary_loader.run()[1]["load_diary"]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "diary.csv")
+        diary.write_csv(path)
+        timings["ingest"] = best_of(repeat, lambda: load_diary(path).collect())
+        df = load_diary(path).collect()
+
+    timings["df_fmt"] = best_of(repeat, lambda: wrapped.diary_format.run(df=df, pl=pl))
+    df_fmt = wrapped.diary_format.run(df=df, pl=pl)[1]["df_fmt"]
+
+    def enrich():
+        return wrapped.full_dataframe.run(df_fmt=df_fmt, movie_cache=movie_cache, pl=pl)
+
+    timings["df_full"] = best_of(repeat, enrich)
+    df_full = enrich()[1]["df_full"]
+
+    WrappedStats = wrapped.wrapped_stats.run()[1]["WrappedStats"]
+    timings["by_year"] = best_of(repeat, lambda: WrappedStats.by_year(df_full))
+    stats_by_year = WrappedStats.by_year(df_full)
+    # the per-year aggregates and the charts run on the busiest year
+    df_year = max(stats_by_year.values(), key=lambda stats: stats.total_movies).df
+    for name in AGGREGATES:
+        timings[f"stats.{name}"] = time_aggregate(WrappedStats, df_year, name, repeat)
+
+    top_from_lists = wrapped.top_k.run()[1]["top_from_lists"]
+    timings["top_from_lists"] = best_of(
+        repeat, lambda: top_from_lists(df_full, LIST_COLUMNS, k=10, by="Watched Year")
+    )
+
+    figures = wrapped.figures.run()[1]
+    stats = WrappedStats(df_year)
+    # the first figure pays for importing plotly, which is not what is measured
+    figures["directors_figure"](stats.director_counts.head(13))
+    builders = {
+        "directors_figure": lambda: figures["directors_figure"](stats.director_counts.head(13)),
+        "hours_per_month_figure": lambda: figures["hours_per_month_figure"](
+            stats.month_hours.select("Month", "Hours")
+        ),
+        "top_scores_figure": lambda: figures["top_scores_figure"](df_year, "Metascore"),
+        "rating_differences_figure": lambda: figures["rating_differences_figure"](
+            df_year, "Rating_Difference_IMDB", "Normalized_IMDB", "IMDB"
+        ),
+    }
+    for name, build in builders.items():
+        timings[f"figure.{name}"] = best_of(repeat, build)
+    return timings
+
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "polars": pl.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def print_results(results: dict, baseline: dict = None) -> None:
+    sizes = list(results["sizes"])
+    stages = list(next(iter(results["sizes"].values())))
+    header = "".join(f"{int(size):>18,}" for size in sizes)
+    print(f"{'stage':<34}{header}")
+    for stage in stages:
+        cells = []
+        for size in sizes:
+            seconds = results["sizes"][size][stage]
+            cell = f"{seconds * 1000:.1f}ms"
+            previous = (baseline or {}).get("sizes", {}).get(size, {}).get(stage)
+            if previous:
+                cell += f" ({seconds / previous:.2f}x)"
+            cells.append(f"{cell:>18}")
+        print(f"{stage:<34}{''.join(cells)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument(
+        "--movies", type=int, help="Distinct movies (default: a fifth of the rows, at most 100k)"
+    )
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default=str(ROOT / "benchmarks" / "results"))
+    parser.add_argument("--compare", help="Previous results file to show ratios against")
+    args = parser.parse_args()
+
+    results = {**environment(), "years": args.years, "repeat": args.repeat, "sizes": {}}
+    for rows in args.sizes:
+        movies = args.movies or max(1, min(rows // 5, 100_000))
+        print(f"{rows} rows, {movies} movies...", flush=True)
+        results["sizes"][str(rows)] = run_size(rows, movies, args.years, args.repeat)
+
+    os.makedirs(args.output, exist_ok=True)
+    stamp = results["created"].replace(":", "").replace("+0000", "")
+    output_path = os.path.join(args.output, f"{stamp}-{results['commit'] or 'nogit'}.json")
+    with open(output_path, "w") as f:
+        json.dump(results, f, indent=4)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"ratios against {args.compare} ({baseline['commit']}, {baseline['created']})")
+    print_results(results, baseline)
+    print(f"Saved {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Synthetic Letterboxd diaries for benchmarks."""
+
+import random
+
+import polars as pl
+
+GENRES = [
+    "Drama", "Comedy", "Thriller", "Romance", "Action", "Crime", "Horror", "Adventure",
+    "Mystery", "Sci-Fi", "Fantasy", "Animation", "Documentary", "Family", "War", "Music",
+]
+COUNTRIES = [
+    "United States", "United Kingdom", "France", "Italy", "Japan", "South Korea",
+    "Germany", "Spain", "Canada", "India",
+]
+LANGUAGES = ["English", "French", "Italian", "Japanese", "Korean", "German", "Spanish", "Hindi"]
+RATED = ["G", "PG", "PG-13", "R", "NC-17", "Not Rated", "N/A"]
+
+
+def synthetic_diary(
+    n_rows: int, n_movies: int = 0, year: int = 2024, years: int = 1
+) -> pl.DataFrame:
+    """Build a diary.csv-shaped frame with `n_rows` entries.
+
+    Entries are spread evenly over the `years` years ending with `year`.
+    Movies repeat once `n_rows` exceeds `n_movies` (default: one per row),
+    which mimics rewatches and keeps the distinct title count controllable.
+    """
+    n_movies = n_movies or n_rows
+    idx = pl.int_range(n_rows, eager=True)
+    movie = idx % n_movies
+    watched = pl.date(year - years + 1, 1, 1) + pl.duration(
+        days=pl.col("i") % (365 * years)
+    )
+
+    return (
+        pl.DataFrame({"i": idx, "movie": movie})
+        .with_columns(
+            watched.dt.strftime("%Y-%m-%d").alias("Date"),
+            pl.format("Movie {}", pl.col("movie")).alias("Name"),
+            (1950 + pl.col("movie") % 75).alias("Year"),
+            pl.format("https://boxd.it/{}", pl.col("i")).alias("Letterboxd URI"),
+            ((pl.col("i") % 10 + 1) / 2).alias("Rating"),
+            pl.when(pl.col("i") >= n_movies).then(pl.lit("Yes")).alias("Rewatch"),
+            pl.lit(None, dtype=pl.String).alias("Tags"),
+            watched.dt.strftime("%Y-%m-%d").alias("Watched Date"),
+        )
+        .drop("i", "movie")
+    )
+
+
+def realistic_diary(
+    n_rows: int, n_movies: int = 0, year: int = 2024, years: int = 1, seed: int = 0
+) -> pl.DataFrame:
+    """Like `synthetic_diary`, with the irregularity of a real diary.
+
+    Watch dates are random within the years (so the diary is not sorted by
+    date), popular movies are watched far more often than the long tail, and
+    ratings cluster around 3.5 stars with some entries left unrated.
+    """
+    diary = synthetic_diary(n_rows, n_movies, year, years)
+    n_movies = n_movies or n_rows
+
+    def uniform(stream: int) -> pl.Expr:
+        # a seeded hash of the row index, so millions of rows need no Python loop
+        return pl.int_range(pl.len()).hash(seed * 3 + stream).cast(pl.Float64) / 2.0**64
+
+    # a squared uniform puts most watches on the first, popular, movies
+    movie = (uniform(0).pow(2) * n_movies).cast(pl.Int64)
+    watched = pl.date(year - years + 1, 1, 1) + pl.duration(
+        days=(uniform(1) * 365 * years).cast(pl.Int64)
+    )
+    stars = uniform(2)
+    return diary.with_columns(
+        watched.dt.strftime("%Y-%m-%d").alias("Date"),
+        watched.dt.strftime("%Y-%m-%d").alias("Watched Date"),
+        pl.format("Movie {}", movie).alias("Name"),
+        (1950 + movie % 75).alias("Year"),
+        pl.when(stars < 0.05)
+        .then(None)
+        .otherwise(((stars.sqrt() * 9).round() + 1) / 2)
+        .alias("Rating"),
+        pl.when(movie.is_first_distinct()).then(None).otherwise(pl.lit("Yes")).alias("Rewatch"),
+    )
+
+
+def realistic_payloads(n_movies: int, seed: int = 0) -> dict:
+    """Varied OMDb payloads for the movies of `synthetic_diary`/`realistic_diary`.
+
+    Directors, writers and actors come from pools that shrink with the
+    catalogue, so names repeat across movies the way they do in a real cache,
+    and some scores, box office figures and ratings are "N/A".
+    """
+    rand = random.Random(seed)
+    people = max(n_movies // 3, 10)
+
+    def person(kind: str) -> str:
+        return f"{kind} {int(people * rand.random() ** 3)}"
+
+    def maybe(value: str) -> str:
+        return value if rand.random() > 0.1 else "N/A"
+
+    payloads = {}
+    for movie in range(n_movies):
+        title, year = f"Movie {movie}", str(1950 + movie % 75)
+        payloads[f"{title}_{year}"] = {
+            "Title": title,
+            "Year": year,
+            "Rated": rand.choice(RATED),
+            "Runtime": f"{int(rand.gauss(110, 20)) if rand.random() > 0.02 else 240} min",
+            "Genre": ", ".join(rand.sample(GENRES, rand.randint(1, 3))),
+            "Director": person("Director"),
+            "Writer": ", ".join(sorted({person("Writer") for _ in range(rand.randint(1, 3))})),
+            "Actors": ", ".join(sorted({person("Actor") for _ in range(3)})),
+            "Language": ", ".join(rand.sample(LANGUAGES, rand.randint(1, 2))),
+            "Country": ", ".join(rand.sample(COUNTRIES, rand.randint(1, 2))),
+            "Poster": f"https://m.media-amazon.com/images/M/{movie}._V1_SX300.jpg",
+            "Metascore": maybe(str(rand.randint(20, 100))),
+            "imdbRating": maybe(f"{rand.uniform(3, 9.5):.1f}"),
+            "imdbID": f"tt{movie:07d}",
+            "BoxOffice": maybe(f"${rand.randint(10_000, 900_000_000):,}"),
+            "Response": "True",
+        }
+    return payloads
+
+
+def synthetic_payloads(n_movies: int, template: dict) -> dict:
+    """Fake OMDb payloads keyed like movie_cache.json for `synthetic_diary` movies."""
+    payloads = {}
+    for movie in range(n_movies):
+        title, year = f"Movie {movie}", str(1950 + movie % 75)
+        payloads[f"{title}_{year}"] = {
+            **template,
+            "Title": title,
+            "Year": year,
+            "imdbID": f"tt{movie:07d}",
+        }
+    return payloads
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import contextlib
+import multiprocessing
+from pathlib import Path
+from typing import List, Optional
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from apps import wrapped, your_wrapped  # noqa: E402
+
+LIST_COLUMNS = ["Genre", "Actors", "Writer", "Country", "Language"]
+
+# users whose names share a worker's string table before it is released
+STRING_CACHE_USERS = 64
+
+# cells of the notebooks, loaded once per worker process
+_pipeline = {}
+
+
+def init_worker(db_path: str, api_key: Optional[str], omdb_url: Optional[str]) -> None:
+    """Run the notebook cells that define the pipeline once per process.
+
+    Every worker opens its own connection to the shared SQLite cache; movies
+    missing from it are fetched from OMDb when an API key is given.
+    """
+    import polars as pl
+
+    # the Categorical columns of every user's df_full index one string table,
+    # so names shared between users are stored once per worker
+    pl.enable_string_cache()
+
+    _, zip_defs = your_wrapped.zip_loader.run()
+    _, store = wrapped.metadata_store.run()
+    cache = store["SqliteMovieCache"](db_path)
+    # readers keep going while another worker writes new movies
+    cache.conn.execute("PRAGMA journal_mode=WAL")
+
+    get_metatadata = None
+    if api_key:
+        client_overrides = {"OMDB_API_URL": omdb_url} if omdb_url else {}
+        _, client = your_wrapped.omdb_client.run(**client_overrides)
+        _, enrichment = your_wrapped.omdb_enrichment.run(
+            get_movie_data=client["get_movie_data"]
+        )
+        get_metatadata = enrichment["get_metatadata"]
+
+    _pipeline.update(
+        process_zip_and_load_csv=zip_defs["process_zip_and_load_csv"],
+        movie_cache=cache,
+        get_metatadata=get_metatadata,
+        api_key=api_key,
+        WrappedStats=wrapped.wrapped_stats.run()[1]["WrappedStats"],
+        top_from_lists=wrapped.top_k.run()[1]["top_from_lists"],
+        users=0,
+    )
+
+
+def enrich_missing(df_fmt, movie_cache) -> int:
+    """Fetch the diary's movies the shared cache does not have yet."""
+    get_metatadata = _pipeline["get_metatadata"]
+    keys = df_fmt["title_year"].unique().to_list()
+    missing = set(keys) - set(movie_cache.get_many(keys))
+    if not missing or get_metatadata is None:
+        return 0
+
+    missing_df = df_fmt.filter(df_fmt["title_year"].is_in(list(missing)))
+    fetched = 0
+    for key, payload in get_metatadata(missing_df, _pipeline["api_key"]).items():
+        if payload is not None:
+            movie_cache.put(key, payload)
+            fetched += 1
+    movie_cache.flush()
+    return fetched
+
+
+def summarize(stats_by_year: dict, top_lists_by_year: dict) -> dict:
+    """JSON-ready wrapped of every year in the diary."""
+    summary = {}
+    for year, stats in sorted(stats_by_year.items()):
+        busiest = stats.busiest_months["Month"]
+        summary[str(year)] = {
+            "total_movies": stats.total_movies,
+            "unique_directors": stats.unique_directors,
+            "total_runtime_hours": stats.total_runtime,
+            "top_directors": stats.director_counts.head(5).rows(),
+            "busiest_month": busiest[0] if len(busiest) else None,
+            "hours_per_month": dict(stats.month_hours.select("Month", "Hours").iter_rows()),
+            "top_rated": stats.rated_counts.head(1).rows(),
+            **{
+                f"top_{column.lower()}": top_lists_by_year[year][column]
+                for column in LIST_COLUMNS
+            },
+        }
+    return summary
+
+
+def wrap_export(zip_path: str, output_dir: str) -> dict:
+    """Run the notebook pipeline on one export and write its JSON summary.
+
+    Returns:
+        dict: the user name, the summary path and the number of movies fetched
+    """
+    import polars as pl
+
+    # the shared string table only grows, so a long-lived worker starts a new
+    # one every STRING_CACHE_USERS users instead of keeping every user's names
+    if _pipeline["users"] == STRING_CACHE_USERS:
+        pl.disable_string_cache()
+        pl.enable_string_cache()
+        _pipeline["users"] = 0
+    _pipeline["users"] += 1
+
+    # the cells log every file and movie, which is noise for a batch
+    with contextlib.redirect_stdout(io.StringIO()):
+        df = _pipeline["process_zip_and_load_csv"](zip_path)["diary"]
+        _, defs = wrapped.diary_format.run(df=df, pl=pl)
+        df_fmt = defs["df_fmt"]
+
+        movie_cache = _pipeline["movie_cache"]
+        fetched = enrich_missing(df_fmt, movie_cache)
+    _, defs = wrapped.full_dataframe.run(df_fmt=df_fmt, movie_cache=movie_cache, pl=pl)
+    df_full = defs["df_full"]
+
+    summary = summarize(
+        _pipeline["WrappedStats"].by_year(df_full),
+        _pipeline["top_from_lists"](df_full, LIST_COLUMNS, k=10, by="Watched Year"),
+    )
+    user = Path(zip_path).stem
+    output_path = os.path.join(output_dir, f"{user}.json")
+    with open(output_path, "w") as f:
+        json.dump(summary, f, indent=4)
+    return {"user": user, "output": output_path, "fetched": fetched}
+
+
+def run_batch(
+    zip_paths: List[str],
+    output_dir: str,
+    db_path: str,
+    workers: int,
+    api_key: Optional[str] = None,
+    omdb_url: Optional[str] = None,
+) -> dict:
+    """Wrap every export across a pool of `workers` processes.
+
+    Returns:
+        dict: users done, failures keyed by export and users per second
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    # one Polars thread pool per core, not per core per worker
+    os.environ["POLARS_MAX_THREADS"] = str(max(1, (os.cpu_count() or 1) // workers))
+
+    done, failed = 0, {}
+    start = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_worker,
+        initargs=(db_path, api_key, omdb_url),
+    ) as pool:
+        futures = {pool.submit(wrap_export, path, output_dir): path for path in zip_paths}
+        for future in as_completed(futures):
+            try:
+                future.result()
+                done += 1
+            except Exception as e:
+                failed[futures[future]] = repr(e)
+    elapsed = time.perf_counter() - start
+    return {"done": done, "failed": failed, "seconds": elapsed, "users_per_second": done / elapsed}
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Compute the wrapped of every Letterboxd export zip in a directory"
+    )
+    parser.add_argument("exports", help="Directory of Letterboxd export zips")
+    parser.add_argument("--output", default="wrapped", help="Directory for the JSON summaries")
+    parser.add_argument("--db", default="movie_cache.db", help="Shared SQLite metadata cache")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument(
+        "--api-key", default=os.getenv("API_KEY"), help="OMDb key for movies missing from the cache"
+    )
+    parser.add_argument("--omdb-url", help="OMDb endpoint, e.g. the local stub")
+    args = parser.parse_args(argv)
+
+    zip_paths = sorted(str(p) for p in Path(args.exports).glob("*.zip"))
+    result = run_batch(
+        zip_paths, args.output, args.db, args.workers, args.api_key, args.omdb_url
+    )
+    for path, error in result["failed"].items():
+        print(f"FAILED {path}: {error}")
+    print(
+        f"Wrapped {result['done']}/{len(zip_paths)} exports with {args.workers} workers "
+        f"in {result['seconds']:.1f}s ({result['users_per_second']:.1f} users/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,27 @@
 #!/usr/bin/env python3
 
 import os
+import sys
+import json
+import hashlib
 import subprocess
 import argparse
-from typing import List
+from typing import Dict, List, Optional
 from pathlib import Path
+from importlib import metadata
+from concurrent.futures import ThreadPoolExecutor
+
+# per-output content hashes of the last build, inside the output directory
+MANIFEST = ".build-manifest.json"
+
+# files besides the notebook that end up in the static report
+STATIC_REPORT_INPUTS = [
+    "scripts/static_report.py",
+    "scripts/batch_wrapped.py",
+    "extracted_files/diary.csv",
+    "movie_cache.parquet",
+    "posters.json",
+]
 
 
 def export_html_wasm(notebook_path: str, output_dir: str, as_app: bool = False) -> bool:
@@ -39,6 +56,93 @@ def export_html_wasm(notebook_path: str, output_dir: str, as_app: bool = False)
         return False
 
 
+def export_static_report(notebook_path: str, output_dir: str) -> bool:
+    """Pre-render the showcase app into a static page, see scripts/static_report.py.
+
+    Returns:
+        bool: True if export succeeded, False otherwise
+    """
+    output_file = os.path.join(output_dir, notebook_path.replace(".py", ".html"))
+    print(f"Exporting {notebook_path} to {output_file} as static report")
+
+    cmd = [sys.executable, "scripts/static_report.py", "--output", output_file]
+    try:
+        subprocess.run(cmd, capture_output=True, text=True, check=True)
+        return True
+    except subprocess.CalledProcessError as e:
+        print(f"Error exporting {notebook_path}:")
+        print(e.stderr)
+        return False
+
+
+def is_notebook(path: Path) -> bool:
+    """Whether `path` is a marimo notebook rather than a module the apps import."""
+    return "marimo.App(" in path.read_text()
+
+
+def export_mode(notebook_path: str, static: bool) -> str:
+    if static and notebook_path == "apps/wrapped.py":
+        return "static"
+    return "app" if notebook_path.startswith("apps/") else "notebook"
+
+
+def content_hash(notebook_path: str, mode: str) -> str:
+    """Hash of everything an export depends on.
+
+    That is the notebook, the `public/` folder marimo copies next to it, the
+    data inputs of the static report, the export mode and the marimo version.
+    """
+    inputs = [Path(notebook_path)]
+    public = Path(notebook_path).parent / "public"
+    if public.is_dir():
+        inputs.extend(sorted(p for p in public.rglob("*") if p.is_file()))
+    if mode == "static":
+        inputs.extend(Path(p) for p in STATIC_REPORT_INPUTS)
+
+    digest = hashlib.sha256(f"{mode}\0{metadata.version('marimo')}".encode())
+    for path in inputs:
+        digest.update(f"\0{path}\0".encode())
+        # optional inputs such as the poster bundle may not be built
+        if path.exists():
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def load_manifest(output_dir: str) -> Dict[str, str]:
+    try:
+        with open(os.path.join(output_dir, MANIFEST), "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(output_dir: str, manifest: Dict[str, str]) -> None:
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=4, sort_keys=True)
+
+
+def build_notebook(
+    notebook_path: str, output_dir: str, mode: str, previous: Optional[str]
+) -> Optional[str]:
+    """Export a notebook unless its output is already built from the same inputs.
+
+    Returns:
+        Optional[str]: the content hash of the output, None if the export failed
+    """
+    digest = content_hash(notebook_path, mode)
+    output_file = os.path.join(output_dir, notebook_path.replace(".py", ".html"))
+    if digest == previous and os.path.exists(output_file):
+        print(f"Skipping {notebook_path}, unchanged")
+        return digest
+
+    if mode == "static":
+        ok = export_static_report(notebook_path, output_dir)
+    else:
+        ok = export_html_wasm(notebook_path, output_dir, as_app=mode == "app")
+    return digest if ok else None
+
+
 def generate_index(all_notebooks: List[str], output_dir: str) -> None:
     """Generate the index.html file."""
     print("Generating index.html")
@@ -90,6 +194,17 @@ def main() -> None:
     parser.add_argument(
         "--output-dir", default="public", help="Output directory for built files"
     )
+    parser.add_argument(
+        "--static",
+        action="store_true",
+        help="Pre-render apps/wrapped.py as a static page instead of WASM",
+    )
+    parser.add_argument(
+        "--jobs", type=int, default=os.cpu_count(), help="Notebooks exported in parallel"
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="Re-export notebooks even if unchanged"
+    )
     args = parser.parse_args()
 
     all_notebooks: List[str] = []
@@ -99,17 +214,25 @@ def main() -> None:
             print(f"Warning: Directory not found: {dir_path}")
             continue
 
-        all_notebooks.extend(str(path) for path in dir_path.rglob("*.py"))
+        all_notebooks.extend(str(path) for path in dir_path.rglob("*.py") if is_notebook(path))
 
     if not all_notebooks:
         print("No notebooks found!")
         return
 
-    # Export notebooks sequentially
-    for nb in all_notebooks:
-        export_html_wasm(nb, args.output_dir, as_app=nb.startswith("apps/"))
-
-    # Generate index only if all exports succeeded
+    # Export notebooks in parallel, skipping the ones built from the same inputs
+    manifest = {} if args.force else load_manifest(args.output_dir)
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        digests = pool.map(
+            lambda nb: build_notebook(
+                nb, args.output_dir, export_mode(nb, args.static), manifest.get(nb)
+            ),
+            all_notebooks,
+        )
+        built = dict(zip(all_notebooks, digests))
+    save_manifest(args.output_dir, {nb: d for nb, d in built.items() if d is not None})
+
+    # Generate index once every export has finished
     generate_index(all_notebooks, args.output_dir)
 
 
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import gzip
+import json
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from apps.wrapped import metadata_store  # noqa: E402
+
+# read next to METADATA_FIELDS by the title index and the SQLite store
+KEY_FIELDS = ["Title", "Year", "imdbID"]
+
+
+def build_snapshot(json_path: str, output_path: str) -> int:
+    """Compile a movie_cache.json into the Parquet snapshot read by the apps.
+
+    Only the fields used by the analysis (METADATA_FIELDS) are kept, typed by
+    `normalize_cache` and sorted by `title_year` so row-group statistics can
+    skip unrelated movies.
+
+    Returns:
+        int: number of movies written
+    """
+    _, defs = metadata_store.run()
+    with open(json_path, "r") as f:
+        cache = json.load(f)
+
+    snapshot = defs["metadata_frame"](defs["normalize_cache"](cache)).sort("title_year")
+    snapshot.write_parquet(output_path, compression="zstd", statistics=True)
+    return snapshot.height
+
+
+def build_export(json_path: str, output_path: str) -> dict:
+    """Compile a movie_cache.json into the compact export the hosted app loads.
+
+    Payloads are typed by `normalize_cache` and projected on KEY_FIELDS and
+    METADATA_FIELDS, then serialized without whitespace and gzip-compressed.
+    `MovieCache` decompresses it transparently.
+
+    Returns:
+        dict: movies written, size of the JSON cache and of the export
+    """
+    _, defs = metadata_store.run()
+    with open(json_path, "r") as f:
+        cache = defs["normalize_cache"](json.load(f))
+
+    fields = KEY_FIELDS + defs["METADATA_FIELDS"]
+    export = {
+        key: {field: payload.get(field) for field in fields}
+        for key, payload in sorted(cache.items())
+        if payload is not None
+    }
+    content = json.dumps(export, separators=(",", ":")).encode()
+    # mtime=0 keeps the file identical when the cache did not change
+    with open(output_path, "wb") as f:
+        f.write(gzip.compress(content, compresslevel=9, mtime=0))
+    return {
+        "movies": len(export),
+        "json_bytes": os.path.getsize(json_path),
+        "export_bytes": os.path.getsize(output_path),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Build the Parquet snapshot and the compact export of the metadata cache"
+    )
+    parser.add_argument("--json", default="movie_cache.json", help="JSON cache to compile")
+    parser.add_argument(
+        "--output", default="movie_cache.parquet", help="Snapshot file to write"
+    )
+    parser.add_argument(
+        "--export", default="movie_cache.json.gz", help="Compact gzip export to write"
+    )
+    args = parser.parse_args()
+
+    count = build_snapshot(args.json, args.output)
+    print(f"Wrote {count} movies to {args.output}")
+    export = build_export(args.json, args.export)
+    print(
+        f"Wrote {export['movies']} movies to {args.export}: {export['export_bytes']:,} bytes, "
+        f"{export['json_bytes'] / export['export_bytes']:.0f}x smaller than {args.json}"
+    )
+
+
+if __name__ == "__main__":
+    main()
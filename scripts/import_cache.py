@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+
+import sys
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from apps.wrapped import metadata_store  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Import movie_cache.json into the SQLite metadata store"
+    )
+    parser.add_argument("--json", default="movie_cache.json", help="JSON cache to import")
+    parser.add_argument("--db", default="movie_cache.db", help="SQLite database to fill")
+    args = parser.parse_args()
+
+    _, defs = metadata_store.run()
+    store = defs["SqliteMovieCache"](args.db)
+    count = store.import_json(args.json)
+    print(f"Imported {count} movies from {args.json} into {args.db}")
+
+
+if __name__ == "__main__":
+    main()
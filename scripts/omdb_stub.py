@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+
+import copy
+import json
+import time
+import random
+import argparse
+import threading
+from collections import Counter
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def load_payloads(cache_path: str) -> Dict[str, dict]:
+    """Load the recorded OMDb payloads from a movie_cache.json file."""
+    with open(cache_path, "r") as f:
+        return json.load(f)
+
+
+NOT_FOUND = {"Response": "False", "Error": "Movie not found!"}
+RATE_LIMITED = {"Response": "False", "Error": "Request limit reached!"}
+
+
+class OmdbStubHandler(BaseHTTPRequestHandler):
+    """Answer OMDb `?t=<title>&y=<year>` queries from recorded payloads.
+
+    Titles that were never recorded get a copy of the first payload with
+    `Title` and `Year` replaced, so any diary can be enriched offline, or
+    OMDb's "Movie not found!" error when the server is `strict`.
+    """
+
+    def do_GET(self) -> None:
+        server = self.server
+        delay = server.delay()
+        if delay:
+            time.sleep(delay)
+
+        query = parse_qs(urlparse(self.path).query)
+        title = query.get("t", [""])[0]
+        year = query.get("y", [""])[0]
+
+        status, payload = server.answer(title, year)
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+class OmdbStubServer(ThreadingHTTPServer):
+    """Serves the recorded payloads with injected latency and errors.
+
+    Each request waits `latency` plus up to `jitter` seconds. Beyond
+    `rate_limit` requests in a second, requests get a 429 with OMDb's
+    "Request limit reached!" error, and `not_found_rate` of the others get
+    "Movie not found!" even if the movie was recorded. Random draws come
+    from `seed`, so a load test can be replayed. `counts` tallies the
+    answers by kind.
+    """
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def delay(self) -> float:
+        with self.lock:
+            return self.latency + self.random.uniform(0, self.jitter)
+
+    def answer(self, title: str, year: str) -> Tuple[int, dict]:
+        """Status code and payload for a `t=title&y=year` query."""
+        with self.lock:
+            second = int(time.monotonic())
+            if second != self.window:
+                self.window, self.window_requests = second, 0
+            self.window_requests += 1
+            if self.rate_limit and self.window_requests > self.rate_limit:
+                self.counts["rate_limited"] += 1
+                return 429, RATE_LIMITED
+            if self.random.random() < self.not_found_rate:
+                self.counts["not_found"] += 1
+                return 200, NOT_FOUND
+
+            payload = self.payloads.get(f"{title}_{year}")
+            if payload is None:
+                if self.strict:
+                    self.counts["not_found"] += 1
+                    return 200, NOT_FOUND
+                payload = copy.deepcopy(self.template)
+                payload.update({"Title": title, "Year": year})
+                self.counts["generated"] += 1
+            else:
+                self.counts["recorded"] += 1
+            return 200, payload
+
+
+def make_server(
+    payloads: Dict[str, dict],
+    host: str = "127.0.0.1",
+    port: int = 0,
+    latency: float = 0.0,
+    jitter: float = 0.0,
+    rate_limit: int = 0,
+    not_found_rate: float = 0.0,
+    strict: bool = False,
+    seed: Optional[int] = None,
+) -> OmdbStubServer:
+    """Create a stub OMDb server; `port=0` picks a free port.
+
+    Args:
+        latency: Seconds every request waits.
+        jitter: Up to this many more seconds, drawn per request.
+        rate_limit: Requests per second answered before 429s; 0 is unlimited.
+        not_found_rate: Share of requests answered "Movie not found!".
+        strict: Answer "Movie not found!" for titles that were not recorded.
+        seed: Seed of the jitter and error draws.
+
+    Returns:
+        OmdbStubServer: the bound server, not yet serving
+    """
+    server = OmdbStubServer((host, port), OmdbStubHandler)
+    server.payloads = payloads
+    server.template = next(iter(payloads.values()))
+    server.latency = latency
+    server.jitter = jitter
+    server.rate_limit = rate_limit
+    server.not_found_rate = not_found_rate
+    server.strict = strict
+    server.random = random.Random(seed)
+    server.lock = threading.Lock()
+    server.window, server.window_requests = None, 0
+    server.counts = Counter()
+    return server
+
+
+def serve_in_background(server: OmdbStubServer) -> str:
+    """Serve from a daemon thread and return the base URL of the stub."""
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}/"
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(description="Local OMDb stand-in server")
+    parser.add_argument(
+        "--cache", default="movie_cache.json", help="Recorded OMDb payloads"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Delay per request in seconds"
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0.0, help="Up to this much more delay, in seconds"
+    )
+    parser.add_argument(
+        "--rate-limit", type=int, default=0, help="Requests per second before 429s (0: off)"
+    )
+    parser.add_argument(
+        "--not-found-rate", type=float, default=0.0, help="Share of \"Movie not found!\" answers"
+    )
+    parser.add_argument(
+        "--strict", action="store_true", help="Unrecorded titles are not found"
+    )
+    parser.add_argument("--seed", type=int, help="Seed of the injected delays and errors")
+    args = parser.parse_args(argv)
+
+    server = make_server(
+        load_payloads(args.cache),
+        args.host,
+        args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        rate_limit=args.rate_limit,
+        not_found_rate=args.not_found_rate,
+        strict=args.strict,
+        seed=args.seed,
+    )
+    print(f"OMDb stub listening on http://{args.host}:{server.server_address[1]}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    print(", ".join(f"{kind}: {count}" for kind, count in sorted(server.counts.items())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+
+import os
+import io
+import sys
+import json
+import base64
+import hashlib
+import argparse
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# OMDb posters are 300x444, thumbnails keep that ratio
+THUMBNAIL_SIZE = (200, 296)
+
+
+def _pillow():
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:
+        raise ImportError(
+            "Poster thumbnails need Pillow: uv pip install 'letterboxd-wrapped[posters]'"
+        ) from None
+    return Image, ImageOps
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(f"{path}.tmp", "wb") as f:
+        f.write(data)
+    os.replace(f"{path}.tmp", path)
+
+
+class PosterStore:
+    """Content-addressed store of poster images.
+
+    Originals live under `originals/<sha256>` and `index.json` maps every
+    poster URL to the hash of its image, so a URL is downloaded once and an
+    image served from two URLs is stored once. Thumbnails are derived from
+    the originals under `thumbnails/<w>x<h>/<sha256>.jpg`.
+
+    With `fixtures`, posters are read from that directory by the file name
+    of their URL instead of being downloaded.
+    """
+
+    def __init__(self, root: str, fixtures: Optional[str] = None):
+        self.root = root
+        self.fixtures = fixtures
+        self.downloads = 0
+        self.hits = 0
+        index_path = os.path.join(root, "index.json")
+        if os.path.exists(index_path):
+            with open(index_path, "r") as f:
+                self.index: Dict[str, str] = json.load(f)
+        else:
+            self.index = {}
+
+    def _original_path(self, digest: str) -> str:
+        return os.path.join(self.root, "originals", digest)
+
+    def _read_source(self, url: str) -> bytes:
+        if self.fixtures:
+            with open(os.path.join(self.fixtures, os.path.basename(urlparse(url).path)), "rb") as f:
+                return f.read()
+        response = requests.get(url, timeout=30)
+        response.raise_for_status()
+        return response.content
+
+    def fetch(self, url: str) -> str:
+        """Store the poster behind `url` unless it already is, returns its hash."""
+        digest = self.index.get(url)
+        if digest and os.path.exists(self._original_path(digest)):
+            self.hits += 1
+            return digest
+
+        data = self._read_source(url)
+        self.downloads += 1
+        digest = hashlib.sha256(data).hexdigest()
+        if not os.path.exists(self._original_path(digest)):
+            _write_atomic(self._original_path(digest), data)
+        self.index[url] = digest
+        return digest
+
+    def thumbnail(self, url: str, size: Tuple[int, int] = THUMBNAIL_SIZE) -> str:
+        """Path of the `size` JPEG thumbnail of a poster, cropped to fill."""
+        digest = self.fetch(url)
+        path = os.path.join(self.root, "thumbnails", f"{size[0]}x{size[1]}", f"{digest}.jpg")
+        if os.path.exists(path):
+            return path
+
+        Image, ImageOps = _pillow()
+        with Image.open(self._original_path(digest)) as image:
+            thumbnail = ImageOps.fit(image.convert("RGB"), size, Image.LANCZOS)
+        buffer = io.BytesIO()
+        thumbnail.save(buffer, "JPEG", quality=80, optimize=True)
+        _write_atomic(path, buffer.getvalue())
+        return path
+
+    def bundle(self, urls: Iterable[str], size: Tuple[int, int] = THUMBNAIL_SIZE) -> Dict[str, str]:
+        """Data URIs of the thumbnails of `urls`, keyed by URL.
+
+        Posters that cannot be fetched are left out, so the notebooks keep
+        linking them directly.
+        """
+        bundle = {}
+        for url in dict.fromkeys(urls):
+            if not url or not url.startswith(("http://", "https://")):
+                continue
+            try:
+                with open(self.thumbnail(url, size), "rb") as f:
+                    encoded = base64.b64encode(f.read()).decode()
+            except (OSError, requests.RequestException) as e:
+                print(f"Skipping poster {url}: {e}")
+                continue
+            bundle[url] = f"data:image/jpeg;base64,{encoded}"
+        return bundle
+
+    def save(self) -> None:
+        _write_atomic(
+            os.path.join(self.root, "index.json"),
+            json.dumps(self.index, indent=4, sort_keys=True).encode(),
+        )
+
+
+def report_posters(diary_path: str, snapshot_path: str) -> list:
+    """Poster URLs the showcase report shows, over every year."""
+    from scripts.static_report import compute_report
+
+    urls = []
+    for year in compute_report(diary_path, snapshot_path).values():
+        for movies in year["posters"].values():
+            urls.extend(movie["Poster"] for movie in movies)
+    return urls
+
+
+def cache_posters(snapshot_path: str) -> list:
+    """Poster URLs of every movie in the metadata snapshot."""
+    import polars as pl
+
+    return pl.read_parquet(snapshot_path, columns=["Poster"])["Poster"].drop_nulls().to_list()
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Cache the showcase posters and bundle their thumbnails as data URIs"
+    )
+    parser.add_argument("--output", default="posters.json", help="Data-URI bundle to write")
+    parser.add_argument("--store", default=".poster_cache", help="Content-addressed poster store")
+    parser.add_argument("--fixtures", help="Read posters from this directory instead of OMDb")
+    parser.add_argument("--size", default="x".join(map(str, THUMBNAIL_SIZE)), help="WIDTHxHEIGHT")
+    parser.add_argument("--diary", default=str(ROOT / "extracted_files" / "diary.csv"))
+    parser.add_argument("--snapshot", default=str(ROOT / "movie_cache.parquet"))
+    parser.add_argument(
+        "--all", action="store_true", help="Bundle every cached movie, not only the report's"
+    )
+    args = parser.parse_args(argv)
+
+    size = tuple(int(side) for side in args.size.split("x"))
+    if args.all:
+        urls = cache_posters(args.snapshot)
+    else:
+        urls = report_posters(args.diary, args.snapshot)
+
+    store = PosterStore(args.store, args.fixtures)
+    bundle = store.bundle(urls, size)
+    store.save()
+    _write_atomic(args.output, json.dumps(bundle, indent=4, sort_keys=True).encode())
+
+    weight = sum(len(uri) for uri in bundle.values())
+    print(
+        f"Bundled {len(bundle)} posters ({weight / 2**10:.0f} KiB) into {args.output}: "
+        f"{store.downloads} downloaded, {store.hits} already in {args.store}"
+    )
+
+
+if __name__ == "__main__":
+    main()
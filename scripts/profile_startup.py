@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+
+import os
+import re
+import ast
+import sys
+import time
+import argparse
+import importlib
+import subprocess
+from pathlib import Path
+from importlib import metadata
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# marimo internals, tested with the marimo version pinned in pyproject.toml
+try:
+    from marimo._ast.app import InternalApp
+    from marimo._runtime.app.script_runner import AppScriptRunner
+
+    AppScriptRunner._cell_iterator
+except (ImportError, AttributeError) as e:
+    sys.exit(f"profile_startup.py needs the marimo version pinned in pyproject.toml ({e})")
+
+
+def notebook_imports(notebook_path: str) -> List[str]:
+    """Modules imported anywhere in a notebook's cells, in order."""
+    tree = ast.parse(Path(notebook_path).read_text())
+    modules: List[str] = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names = [node.module]
+        else:
+            continue
+        for name in names:
+            top = name.split(".")[0]
+            # modules next to the notebook, like the opt-in apps/cell_tracer.py
+            if (Path(notebook_path).parent / f"{top}.py").exists():
+                continue
+            if name not in modules and top not in ("marimo", "__future__"):
+                modules.append(name)
+    return modules
+
+
+def import_time(module: str) -> Optional[float]:
+    """Seconds to import `module` in a fresh interpreter, from `-X importtime`."""
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True,
+    )
+    if out.returncode != 0:
+        return None
+    match = re.search(rf"\|\s*(\d+)\s*\|\s*{re.escape(module)}\s*$", out.stderr, re.M)
+    return int(match.group(1)) / 1e6 if match else None
+
+
+def module_bytes(module: str, distributions: Dict[str, List[str]]) -> Optional[int]:
+    """Installed size of the distribution providing `module`, None for the stdlib.
+
+    In the WASM build this is roughly what has to be downloaded before the
+    module can be imported.
+    """
+    total = 0
+    for dist_name in distributions.get(module.split(".")[0], []):
+        dist = metadata.distribution(dist_name)
+        for file in dist.files or []:
+            path = file.locate()
+            if os.path.isfile(path):
+                total += os.path.getsize(path)
+    return total or None
+
+
+class TimedScriptRunner(AppScriptRunner):
+    """Runs an app like `app.run()`, timing every cell it executes.
+
+    When the notebook's `instrumentation` cell has created a `tracer`
+    (`WRAPPED_TRACE` is set), the runner drives it the way the marimo kernel
+    does and writes its trace at the end of the run.
+    """
+
+    def __init__(self, app: InternalApp, filename: Optional[str]) -> None:
+        super().__init__(app, filename)
+        self.timings: List[Tuple[str, float]] = []
+        self.tracer = None
+
+    @staticmethod
+    def _notebook_tracer():
+        # the cells' globals are the patched __main__ module while the app runs
+        return getattr(sys.modules.get("__main__"), "tracer", None)
+
+    def _cell_iterator(self):
+        try:
+            for cell in super()._cell_iterator():
+                if self.tracer is not None:
+                    self.tracer.cell_started(cell)
+                start = time.perf_counter()
+                yield cell
+                self.timings.append((cell_label(self.app, cell), time.perf_counter() - start))
+                self.tracer = self.tracer or self._notebook_tracer()
+                if self.tracer is not None:
+                    self.tracer.cell_finished(cell)
+        finally:
+            if self.tracer is not None:
+                self.tracer.write()
+
+
+def cell_label(app: InternalApp, cell) -> str:
+    """The cell's name if it has one, else its defs or its first line of code."""
+    name = app.cell_manager.cell_data_at(cell.cell_id).name
+    if name != "_":
+        return name
+    if cell.defs:
+        return ", ".join(sorted(cell.defs))[:40]
+    first_line = cell.code.strip().splitlines()[0] if cell.code.strip() else ""
+    return first_line[:40]
+
+
+def profile_cells(
+    notebook_path: str,
+) -> Tuple[List[Tuple[str, float]], Optional[str], Optional[object]]:
+    """Run the notebook headless and time each cell.
+
+    Returns:
+        tuple: (cell label, seconds) in execution order, the error that
+        stopped the run if any (e.g. an upload the app is waiting for), and
+        the notebook's tracer when tracing is enabled
+    """
+    # like the marimo kernel, so the notebook can import the modules next to it
+    sys.path.insert(0, str(Path(notebook_path).resolve().parent))
+    spec = importlib.util.spec_from_file_location("notebook", notebook_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    app = module.app
+    app._maybe_initialize()
+
+    runner = TimedScriptRunner(InternalApp(app), filename=notebook_path)
+    try:
+        runner.run()
+        error = None
+    except Exception as e:
+        error = f"{type(e).__name__}: {str(e).splitlines()[0]}"
+    return runner.timings, error, runner.tracer
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Profile the imports and cell execution times of a notebook"
+    )
+    parser.add_argument("notebook", nargs="?", default="apps/your_wrapped.py")
+    parser.add_argument(
+        "--trace", help="Write a Chrome trace of the cells and OMDb calls to this file"
+    )
+    args = parser.parse_args(argv)
+    if args.trace:
+        os.environ["WRAPPED_TRACE"] = args.trace
+
+    distributions = metadata.packages_distributions()
+    print(f"{'module':<20} {'import':>9} {'bytes':>10}")
+    for module in notebook_imports(args.notebook):
+        seconds = import_time(module)
+        size = module_bytes(module, distributions)
+        shown_time = f"{seconds * 1000:>7.1f}ms" if seconds is not None else f"{'-':>9}"
+        shown_size = f"{size / 2**20:>7.1f}MiB" if size else f"{'stdlib':>10}"
+        print(f"{module:<20} {shown_time} {shown_size}")
+
+    timings, error, tracer = profile_cells(args.notebook)
+    elapsed = 0.0
+    print(f"\n{'#':>3} {'cell':<40} {'time':>9} {'elapsed':>9}")
+    for i, (label, seconds) in enumerate(timings):
+        elapsed += seconds
+        print(f"{i:>3} {label:<40} {seconds * 1000:>7.1f}ms {elapsed * 1000:>7.1f}ms")
+    print(f"{len(timings)} cells ran in {elapsed:.2f}s")
+    if error:
+        print(f"stopped at cell {len(timings)}: {error}")
+    if tracer is not None:
+        counters = ", ".join(f"{name}={value:g}" for name, value in tracer.counters.items())
+        print(f"\nWrote trace to {args.trace} ({counters})")
+        print(tracer.summary().head(10))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import gzip
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+from typing import Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import polars as pl  # noqa: E402
+import plotly.io as pio  # noqa: E402
+import plotly.offline  # noqa: E402
+
+from apps import wrapped  # noqa: E402
+from scripts.batch_wrapped import LIST_COLUMNS, summarize  # noqa: E402
+
+PLOTLY_CDN = f"https://cdn.plot.ly/plotly-{plotly.offline.get_plotlyjs_version()}.min.js"
+
+PAGE = """<!DOCTYPE html>
+<html lang="en">
+  <head>
+    <meta charset="UTF-8" />
+    <meta name="viewport" content="width=device-width, initial-scale=1.0" />
+    <title>Letterboxd Movie Analysis</title>
+    <link href="https://cdn.jsdelivr.net/npm/tailwindcss@2.2.19/dist/tailwind.min.css" rel="stylesheet">
+    <script src="__PLOTLY__"></script>
+  </head>
+  <body class="font-sans max-w-4xl mx-auto p-8 leading-relaxed">
+    <h1 class="text-3xl font-bold text-center mb-4">Letterboxd Movie Analysis</h1>
+    <div class="text-center mb-8">
+      <label>Wrapped year <select id="year" class="border rounded px-2"></select></label>
+    </div>
+    <ul id="stats" class="list-disc mb-8"></ul>
+    <div id="directors"></div>
+    <h2 class="text-xl font-bold text-center mt-8">Longest Movies</h2>
+    <div id="longest" class="flex justify-center gap-4"></div>
+    <div id="hours_per_month"></div>
+    <h2 class="text-xl font-bold text-center mt-8">Box Office sensation</h2>
+    <div id="boxoffice" class="flex justify-center gap-4"></div>
+    <h2 class="text-xl font-bold text-center mt-8">Highest Rated Movies</h2>
+    <div id="user_rating" class="flex justify-center gap-4"></div>
+    <div id="metascore"></div>
+    <div id="imdb"></div>
+    <h2 class="text-xl font-bold text-center mt-8">Critics vs. Audience</h2>
+    <div id="metascore_difference"></div>
+    <div id="imdb_difference"></div>
+    <script>
+      const REPORT = __REPORT__;
+      const DEFAULT_YEAR = "__YEAR__";
+
+      function escape(text) {
+        const span = document.createElement("span");
+        span.textContent = text ?? "-";
+        return span.innerHTML;
+      }
+
+      function top(items) {
+        return items.length ? escape(items[0][0]) : "-";
+      }
+
+      function posters(id, movies) {
+        document.getElementById(id).innerHTML = movies.map((m) =>
+          `<figure class="text-center w-48"><img src="${escape(m.Poster)}" alt="${escape(m.Name)} poster" loading="lazy" />` +
+          `<figcaption>${escape(m.Name)}</figcaption></figure>`
+        ).join("");
+      }
+
+      function render(year) {
+        const report = REPORT[year];
+        const s = report.stats;
+        document.getElementById("stats").innerHTML = [
+          `Total Movies Watched: <b>${s.total_movies}</b>`,
+          `Unique Directors: <b>${s.unique_directors}</b>`,
+          `Top Director: <b>${top(s.top_directors)}</b>`,
+          `Total Runtime: <b>${s.total_runtime_hours}</b> hours`,
+          `Busiest month: <b>${escape(s.busiest_month)}</b>`,
+          `Top Genre: <b>${top(s.top_genre)}</b>`,
+          `Top Actor: <b>${top(s.top_actors)}</b>`,
+          `Top Writer: <b>${top(s.top_writer)}</b>`,
+          `Top Country and Language: <b>${top(s.top_country)}</b>, <b>${top(s.top_language)}</b>`,
+        ].map((item) => `<li>${item}</li>`).join("");
+        for (const [id, figure] of Object.entries(report.figures)) {
+          Plotly.react(id, figure.data, figure.layout, {responsive: true});
+        }
+        for (const [id, movies] of Object.entries(report.posters)) {
+          posters(id, movies);
+        }
+      }
+
+      const select = document.getElementById("year");
+      select.innerHTML = Object.keys(REPORT).map((y) => `<option>${y}</option>`).join("");
+      select.value = DEFAULT_YEAR in REPORT ? DEFAULT_YEAR : Object.keys(REPORT).at(-1);
+      select.addEventListener("change", () => render(select.value));
+      render(select.value);
+      document.body.dataset.firstRender = performance.now();
+    </script>
+  </body>
+</html>
+"""
+
+
+def compute_report(diary_path: str, snapshot_path: str) -> dict:
+    """Run the showcase cells at build time and collect what the page shows.
+
+    Returns:
+        dict: per year, the stats summary, the poster lists and the Plotly
+        figures as JSON
+    """
+    _, defs = wrapped.diary_loader.run()
+    df = defs["load_diary"](diary_path).collect()
+    _, defs = wrapped.diary_format.run(df=df, pl=pl)
+    df_fmt = defs["df_fmt"]
+
+    _, store = wrapped.metadata_store.run()
+    movie_cache = store["SnapshotMovieCache"](snapshot_path, remote=False)
+    _, defs = wrapped.full_dataframe.run(df_fmt=df_fmt, movie_cache=movie_cache, pl=pl)
+    df_full = defs["df_full"]
+
+    stats_by_year = wrapped.wrapped_stats.run()[1]["WrappedStats"].by_year(df_full)
+    top_lists = wrapped.top_k.run()[1]["top_from_lists"](
+        df_full, LIST_COLUMNS, k=10, by="Watched Year"
+    )
+    summary = summarize(stats_by_year, top_lists)
+    _, figures = wrapped.figures.run()
+
+    report = {}
+    for year, stats in sorted(stats_by_year.items()):
+        # years without any OMDb metadata have nothing to show
+        if not stats.total_runtime:
+            continue
+        df_year = stats.df
+        year_figures = {
+            "directors": figures["directors_figure"](stats.director_counts.head(13)),
+            "hours_per_month": figures["hours_per_month_figure"](
+                stats.month_hours.select("Month", "Hours")
+            ),
+            "metascore": figures["top_scores_figure"](df_year, "Metascore"),
+            "imdb": figures["top_scores_figure"](df_year, "imdbRating"),
+            "metascore_difference": figures["rating_differences_figure"](
+                df_year, "Rating_Difference_Metascore", "Normalized_Metascore", "Metascore"
+            ),
+            "imdb_difference": figures["rating_differences_figure"](
+                df_year, "Rating_Difference_IMDB", "Normalized_IMDB", "IMDB"
+            ),
+        }
+        report[str(year)] = {
+            "stats": summary[str(year)],
+            "posters": {
+                "longest": df_year.select("Name", "Runtime_normalized", "Poster")
+                .drop_nulls()
+                .sort("Runtime_normalized", descending=True)
+                .select("Name", "Poster")
+                .head(3)
+                .to_dicts(),
+                "boxoffice": df_year.select("Name", "BoxOffice", "Poster")
+                .drop_nulls()
+                .sort("BoxOffice", descending=True)
+                .select("Name", "Poster")
+                .head(1)
+                .to_dicts(),
+                "user_rating": df_year.select("Name", "Rating", "Poster")
+                .drop_nulls()
+                .sort("Rating", descending=True)
+                .select("Name", "Poster")
+                .head(3)
+                .to_dicts(),
+            },
+            "figures": {
+                name: json.loads(pio.to_json(fig, validate=False))
+                for name, fig in year_figures.items()
+            },
+        }
+    return report
+
+
+def use_poster_bundle(report: dict, bundle_path: str) -> None:
+    """Point the report's posters at the thumbnails of scripts/poster_cache.py."""
+    if not os.path.exists(bundle_path):
+        return
+    with open(bundle_path, "r") as f:
+        bundle = json.load(f)
+    for year in report.values():
+        for movies in year["posters"].values():
+            for movie in movies:
+                movie["Poster"] = bundle.get(movie["Poster"], movie["Poster"])
+
+
+def render_page(report: dict, default_year: int) -> str:
+    """Embed the report in the static page; `</` is escaped for the script tag."""
+    payload = json.dumps(report, separators=(",", ":")).replace("</", "<\\/")
+    return (
+        PAGE.replace("__PLOTLY__", PLOTLY_CDN)
+        .replace("__YEAR__", str(default_year))
+        .replace("__REPORT__", payload)
+    )
+
+
+def write_static_report(
+    output_path: str,
+    diary_path: str = str(ROOT / "extracted_files" / "diary.csv"),
+    snapshot_path: str = str(ROOT / "movie_cache.parquet"),
+    default_year: int = 2024,
+    posters_path: str = str(ROOT / "posters.json"),
+) -> None:
+    report = compute_report(diary_path, snapshot_path)
+    use_poster_bundle(report, posters_path)
+    page = render_page(report, default_year)
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(output_path, "w") as f:
+        f.write(page)
+
+
+def page_weight(paths: list) -> tuple:
+    """Raw and gzip-compressed bytes of the files a page loads from the build."""
+    raw = compressed = 0
+    for path in paths:
+        with open(path, "rb") as f:
+            data = f.read()
+        raw += len(data)
+        compressed += len(gzip.compress(data))
+    return raw, compressed
+
+
+def first_render(url: str, ready: str, timeout_ms: int = 300_000) -> Optional[tuple]:
+    """Seconds until `ready` matches in headless Chromium, and bytes downloaded.
+
+    Needs the optional `playwright` package; returns None without it.
+    """
+    try:
+        from playwright.sync_api import sync_playwright
+    except ImportError:
+        return None
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch()
+        page = browser.new_page()
+        downloaded = []
+        page.on("requestfinished", lambda r: downloaded.append(r.sizes()["responseBodySize"]))
+        start = time.perf_counter()
+        page.goto(url)
+        page.wait_for_selector(ready, timeout=timeout_ms)
+        elapsed = time.perf_counter() - start
+        browser.close()
+    return elapsed, sum(downloaded)
+
+
+def compare_with_wasm(static_path: str) -> None:
+    """Print page weight and time-to-first-render of the static and WASM builds."""
+    with tempfile.TemporaryDirectory() as tmp:
+        wasm_path = os.path.join(tmp, "wrapped.html")
+        subprocess.run(
+            ["marimo", "export", "html-wasm", "apps/wrapped.py", "--mode", "run",
+             "--no-show-code", "-o", wasm_path],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        )
+        wasm_files = [os.path.join(d, f) for d, _, fs in os.walk(tmp) for f in fs]
+
+        with tempfile.NamedTemporaryFile(suffix=".js") as plotly_js:
+            plotly_js.write(plotly.offline.get_plotlyjs().encode())
+            plotly_js.flush()
+            weights = {
+                "static": page_weight([static_path, plotly_js.name]),
+                "wasm": page_weight(wasm_files),
+            }
+
+        print(f"{'build':>7} {'page weight':>12} {'gzipped':>10} {'first render':>13} {'downloaded':>11}")
+        for name, (raw, compressed) in weights.items():
+            path, ready = (
+                (static_path, "body[data-first-render]") if name == "static"
+                else (wasm_path, ".js-plotly-plot")
+            )
+            measured = first_render(Path(path).resolve().as_uri(), ready)
+            render = f"{measured[0]:>12.2f}s" if measured else f"{'-':>13}"
+            downloaded = f"{measured[1] / 2**20:>8.1f}MiB" if measured else f"{'-':>11}"
+            print(
+                f"{name:>7} {raw / 2**20:>9.2f}MiB {compressed / 2**20:>7.2f}MiB "
+                f"{render} {downloaded}"
+            )
+        # the WASM page also fetches Pyodide and the Python wheels at startup
+        print("wasm page weight excludes the Pyodide runtime and wheels fetched at load")
+        if measured is None:
+            print("install playwright (and `playwright install chromium`) to time the first render")
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Pre-render apps/wrapped.py into a static HTML report"
+    )
+    parser.add_argument("--output", default="public/apps/wrapped.html", help="Page to write")
+    parser.add_argument("--diary", default=str(ROOT / "extracted_files" / "diary.csv"))
+    parser.add_argument("--snapshot", default=str(ROOT / "movie_cache.parquet"))
+    parser.add_argument("--year", type=int, default=2024, help="Year shown first")
+    parser.add_argument(
+        "--posters", default=str(ROOT / "posters.json"), help="Poster bundle, used if it exists"
+    )
+    parser.add_argument(
+        "--compare", action="store_true", help="Compare weight and first render with the WASM build"
+    )
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    write_static_report(args.output, args.diary, args.snapshot, args.year, args.posters)
+    print(f"Wrote {args.output} in {time.perf_counter() - start:.1f}s")
+    if args.compare:
+        compare_with_wasm(args.output)
+
+
+if __name__ == "__main__":
+    main()
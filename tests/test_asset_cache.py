@@ -0,0 +1,55 @@
+"""`AssetCache` never stores the empty body of a 304 it cannot revalidate."""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import requests  # noqa: E402
+
+from apps.wrapped import asset_cache  # noqa: E402
+
+
+def response(status, content=b"", headers=None):
+    return SimpleNamespace(
+        status_code=status,
+        content=content,
+        headers=headers or {},
+        url="https://example.com/diary.csv",
+        raise_for_status=lambda: None,
+    )
+
+
+class AssetCacheTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache = asset_cache.run()[1]["AssetCache"](tmp.name)
+
+    def test_304_without_a_stored_copy_downloads_the_body(self):
+        answers = [response(304), response(200, b"Date,Name\n", {"ETag": '"v1"'})]
+        with mock.patch.object(requests, "get", side_effect=answers) as get:
+            body = self.cache.get("https://example.com/diary.csv")
+        self.assertEqual(body, b"Date,Name\n")
+        self.assertNotIn("If-None-Match", get.call_args.kwargs["headers"])
+        self.assertEqual(self.cache.stats()["downloads"], 1)
+
+        # the body was stored, so the next 304 is served from disk
+        with mock.patch.object(requests, "get", return_value=response(304)) as get:
+            self.assertEqual(self.cache.get("https://example.com/diary.csv"), b"Date,Name\n")
+        self.assertEqual(get.call_args.kwargs["headers"]["If-None-Match"], '"v1"')
+
+    def test_repeated_304_without_a_stored_copy_fails(self):
+        with mock.patch.object(requests, "get", return_value=response(304)):
+            with self.assertRaises(requests.HTTPError):
+                self.cache.get("https://example.com/diary.csv")
+        self.assertEqual(self.cache.stats()["downloads"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
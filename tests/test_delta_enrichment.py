@@ -0,0 +1,88 @@
+"""Repeat uploads reuse their own account's enrichment state only."""
+
+import io
+import os
+import sys
+import tempfile
+import unittest
+import contextlib
+from datetime import date
+from unittest import mock
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import polars as pl  # noqa: E402
+
+from apps.your_wrapped import delta_enrichment, metadata_fields, title_index  # noqa: E402
+
+
+def diary(uris, names):
+    return pl.DataFrame(
+        {
+            "Date": [date(2024, 1, day) for day in range(1, len(uris) + 1)],
+            "Letterboxd URI": uris,
+            "title_year": [f"{name}_2020" for name in names],
+        }
+    )
+
+
+def enrichment(fetched):
+    """The delta_enrichment cell, recording the titles sent to OMDb in `fetched`."""
+
+    def get_metatadata(diary_df, api_key):
+        fetched.extend(diary_df["title_year"])
+        return {
+            key: {"Title": key.rsplit("_", 1)[0], "Year": "2020", "Runtime": 90}
+            for key in diary_df["title_year"]
+        }
+
+    return delta_enrichment.run(
+        TitleIndex=title_index.run()[1]["TitleIndex"],
+        get_metatadata=get_metatadata,
+        metadata_frame=metadata_fields.run()[1]["metadata_frame"],
+        tracer=None,
+    )[1]
+
+
+class DeltaEnrichmentTest(unittest.TestCase):
+    def test_accounts_do_not_share_state(self):
+        fetched = []
+        with tempfile.TemporaryDirectory() as root, mock.patch.dict(
+            os.environ, {"WRAPPED_STATE_DIR": root}
+        ):
+            defs = enrichment(fetched)
+            first = diary(["boxd.it/a1", "boxd.it/a2"], ["Alpha", "Beta"])
+            other = diary(["boxd.it/b1", "boxd.it/b2"], ["Gamma", "Delta"])
+            again = diary(["boxd.it/a1", "boxd.it/a2", "boxd.it/a3"], ["Alpha", "Beta", "Epsilon"])
+            with contextlib.redirect_stdout(io.StringIO()):
+                for export in (first, other, again):
+                    defs["enrich_delta"](export, "key")
+
+        self.assertEqual(
+            fetched, ["Alpha_2020", "Beta_2020", "Gamma_2020", "Delta_2020", "Epsilon_2020"]
+        )
+        self.assertEqual(defs["account_state_path"](first), defs["account_state_path"](again))
+        self.assertNotEqual(defs["account_state_path"](first), defs["account_state_path"](other))
+
+    def test_state_survives_deleting_the_oldest_entry(self):
+        fetched = []
+        with tempfile.TemporaryDirectory() as root, mock.patch.dict(
+            os.environ, {"WRAPPED_STATE_DIR": root}
+        ):
+            defs = enrichment(fetched)
+            first = diary(["boxd.it/a1", "boxd.it/a2", "boxd.it/a3"], ["Alpha", "Beta", "Gamma"])
+            other = diary(["boxd.it/b1"], ["Delta"])
+            # a1 was deleted, so the oldest entry and the key change
+            again = diary(["boxd.it/a2", "boxd.it/a3"], ["Beta", "Gamma"])
+            with contextlib.redirect_stdout(io.StringIO()):
+                for export in (first, other, again):
+                    defs["enrich_delta"](export, "key")
+            self.assertEqual(len(os.listdir(root)), 2)
+
+        self.assertEqual(fetched, ["Alpha_2020", "Beta_2020", "Gamma_2020", "Delta_2020"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+"""`cached_figure` must key figures by the values they plot."""
+
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import polars as pl  # noqa: E402
+
+from apps import wrapped, your_wrapped  # noqa: E402
+
+
+def directors(fig) -> tuple:
+    return tuple(y for trace in fig.data for y in trace.y)
+
+
+class CachedFigureTest(unittest.TestCase):
+    def test_categorical_names_with_the_same_codes(self):
+        # both frames get codes 0 and 1 from their own local string table
+        first = pl.DataFrame(
+            {"Director": ["Alice A", "Bob B"], "count": [3, 2]},
+            schema_overrides={"Director": pl.Categorical},
+        )
+        second = pl.DataFrame(
+            {"Director": ["Carol C", "Dan D"], "count": [3, 2]},
+            schema_overrides={"Director": pl.Categorical},
+        )
+        for app in (wrapped, your_wrapped):
+            with self.subTest(app=app.__name__):
+                defs = app.figures.run()[1]
+                cached_figure = defs["cached_figure"]
+                directors_figure = defs["directors_figure"]
+                first_fig = cached_figure(directors_figure, first)
+                second_fig = cached_figure(directors_figure, second)
+                self.assertEqual(directors(first_fig), ("Alice A", "Bob B"))
+                self.assertEqual(directors(second_fig), ("Carol C", "Dan D"))
+                self.assertEqual(len(defs["figure_json"]), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
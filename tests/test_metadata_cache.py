@@ -0,0 +1,44 @@
+"""Payloads with an unexpected value must still be cached."""
+
+import io
+import os
+import sys
+import tempfile
+import unittest
+import contextlib
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from apps import wrapped  # noqa: E402
+
+PAYLOAD = {
+    "Title": "Past Lives",
+    "Year": "2023",
+    "Runtime": "1 h 45 min",
+    "imdbRating": "7.8",
+    "Genre": "Drama, Romance",
+    "Response": "True",
+}
+
+
+class MetadataCacheTest(unittest.TestCase):
+    def test_unexpected_field_is_stored_as_null(self):
+        defs = wrapped.metadata_store.run()[1]
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, "movie_cache.json")
+            cache = defs["MovieCache"](path, writable=True)
+            with contextlib.redirect_stdout(io.StringIO()) as out:
+                cache.put("Past Lives_2023", PAYLOAD)
+                cache.flush()
+            self.assertIn("unexpected Runtime", out.getvalue())
+
+            entry = defs["MovieCache"](path, writable=True).get("Past Lives_2023")
+            self.assertIsNone(entry["Runtime"])
+            self.assertEqual(entry["imdbRating"], 7.8)
+            self.assertEqual(entry["Genre"], ["Drama", "Romance"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,34 @@
+"""The OMDb stub must answer titles exactly as the notebooks send them."""
+
+import sys
+import unittest
+from pathlib import Path
+
+import requests
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from scripts.omdb_stub import make_server, serve_in_background  # noqa: E402
+
+
+class OmdbStubTest(unittest.TestCase):
+    def test_titles_with_plus_and_spaces(self):
+        payloads = {
+            "Romeo + Juliet_1996": {"Title": "Romeo + Juliet", "Year": "1996", "Response": "True"},
+            "Past Lives_2023": {"Title": "Past Lives", "Year": "2023", "Response": "True"},
+        }
+        server = make_server(payloads, strict=True)
+        url = serve_in_background(server)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        for key, payload in payloads.items():
+            title, year = key.rsplit("_", 1)
+            with self.subTest(title=title):
+                data = requests.get(url, params={"t": title, "y": year}, timeout=5).json()
+                self.assertEqual(data, payload)
+
+
+if __name__ == "__main__":
+    unittest.main()
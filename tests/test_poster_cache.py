@@ -0,0 +1,68 @@
+"""`PosterStore.bundle` builds thumbnails offline from fixture images."""
+
+import io
+import os
+import sys
+import base64
+import tempfile
+import unittest
+import contextlib
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from scripts.poster_cache import THUMBNAIL_SIZE, PosterStore  # noqa: E402
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+
+@unittest.skipIf(Image is None, "needs the posters extra (Pillow)")
+class PosterStoreTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.fixtures = os.path.join(tmp.name, "fixtures")
+        self.store = os.path.join(tmp.name, "store")
+        os.makedirs(self.fixtures)
+        Image.new("RGB", (300, 444), "red").save(os.path.join(self.fixtures, "red.jpg"))
+        Image.new("RGB", (300, 444), "blue").save(os.path.join(self.fixtures, "blue.png"))
+        # the same image behind a second URL is stored once
+        Image.new("RGB", (300, 444), "red").save(os.path.join(self.fixtures, "copy.jpg"))
+
+    def test_bundle(self):
+        urls = [
+            "https://m.media-amazon.com/images/red.jpg",
+            "https://m.media-amazon.com/images/blue.png",
+            "https://m.media-amazon.com/images/copy.jpg",
+            "https://m.media-amazon.com/images/missing.jpg",
+            "N/A",
+            None,
+        ]
+        store = PosterStore(self.store, fixtures=self.fixtures)
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            bundle = store.bundle(urls)
+        store.save()
+
+        self.assertEqual((store.downloads, store.hits), (3, 0))
+        self.assertEqual(sorted(bundle), sorted(urls[:3]))
+        self.assertIn("missing.jpg", out.getvalue())
+        self.assertEqual(len(os.listdir(os.path.join(self.store, "originals"))), 2)
+        for uri in bundle.values():
+            prefix, encoded = uri.split(",", 1)
+            self.assertEqual(prefix, "data:image/jpeg;base64")
+            with Image.open(io.BytesIO(base64.b64decode(encoded))) as thumbnail:
+                self.assertEqual(thumbnail.size, THUMBNAIL_SIZE)
+
+        # a second run reads every poster from the store
+        again = PosterStore(self.store, fixtures=self.fixtures)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(again.bundle(urls), bundle)
+        self.assertEqual((again.downloads, again.hits), (0, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+"""`process_zip_and_load_csv` types the diary like a single read would and
+streams members without holding a whole one in memory."""
+
+import io
+import os
+import sys
+import json
+import zipfile
+import tempfile
+import unittest
+import contextlib
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import polars as pl  # noqa: E402
+
+from apps.your_wrapped import zip_loader  # noqa: E402
+from benchmarks.bench_zip_ingest import write_bomb, write_export  # noqa: E402
+from benchmarks.synthetic import synthetic_diary  # noqa: E402
+
+
+class ZipLoaderTest(unittest.TestCase):
+    def test_rating_stays_float_across_unrated_chunks(self):
+        # enough unrated rows for a whole CHUNK_SIZE slice to start unrated
+        diary = synthetic_diary(25_200, years=3)
+        ratings = diary["Rating"].to_list()
+        diary = diary.with_columns(
+            pl.Series("Rating", ratings[:200] + [None] * 24_800 + ratings[25_000:], pl.Float64)
+        )
+        export = io.BytesIO()
+        with zipfile.ZipFile(export, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("diary.csv", diary.write_csv())
+
+        defs = zip_loader.run()[1]
+        self.assertGreater(len(diary.write_csv()), defs["CHUNK_SIZE"])
+        frames = defs["process_zip_and_load_csv"](export.getvalue())
+        self.assertEqual(frames["diary"].schema["Rating"], pl.Float64)
+        self.assertEqual(frames["diary"]["Rating"].to_list(), diary["Rating"].to_list())
+
+    def test_streaming_transient_stays_within_a_few_chunks(self):
+        chunk_mib = zip_loader.run()[1]["CHUNK_SIZE"] / 2**20
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "export.zip")
+            # a diary larger than the allowance, so reading it whole would fail
+            self.assertGreater(write_export(path, 200_000, 3) / 2**20, 8 * chunk_mib)
+            # a fresh process, so the peak is this load's alone
+            out = subprocess.run(
+                [
+                    sys.executable, str(ROOT / "benchmarks" / "bench_zip_ingest.py"),
+                    "--variant", "stream", "--path", path,
+                ],
+                capture_output=True, text=True, check=True,
+            )
+        result = json.loads(out.stdout.splitlines()[-1])
+        self.assertLessEqual(result["transient_mib"], 8 * chunk_mib)
+
+    def test_zip_bomb_is_rejected(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            bomb = os.path.join(tmp, "bomb.zip")
+            write_bomb(bomb, 16 * 2**20)
+            with self.assertRaises(ValueError), contextlib.redirect_stdout(io.StringIO()):
+                zip_loader.run()[1]["process_zip_and_load_csv"](bomb)
+
+
+if __name__ == "__main__":
+    unittest.main()